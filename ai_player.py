@@ -1,12 +1,47 @@
 # ai_player.py - AI player using minimax with alpha-beta pruning
 
 import random
+import time
 from copy import deepcopy
-from utils.constants import RED, WHITE
+from utils.constants import RED, WHITE, DEFAULT_EVAL_WEIGHTS
+from components.bitboard import BitBoard, square_to_rowcol, evaluation_tables
+from engine.transposition import TranspositionTable, DEFAULT_SIZE_MB, REPLACE_DEPTH, EXACT, LOWER, UPPER
+from engine.book import OpeningBook
+from engine.tablebase import Tablebase, WIN, LOSS
+from engine.ordering import MoveOrderer
+from engine.stats import SearchStats
+from utils.zobrist import SIDE_KEY
+
+# Board representations the AI can search on
+BACKENDS = ("board", "bitboard")
+
+# Deepest iteration tried when searching against a time budget
+MAX_SEARCH_DEPTH = 64
+
+# Half-width of the window around the previous iteration's score that iterative
+# deepening tries first; a score outside it is searched again with a full window
+ASPIRATION_WINDOW = 5
+
+# How many nodes are searched between clock checks
+TIME_CHECK_INTERVAL = 512
+
+# Score of a tablebase win with nothing left to play; each ply to the win costs a point
+TABLEBASE_WIN_SCORE = 1000
+
+# Most nodes the capture-only quiescence search may visit below one horizon position
+QUIESCENCE_NODE_LIMIT = 200
+
+
+class SearchTimeout(Exception):
+    """Raised inside minimax when the time budget for a move runs out or the search is cancelled"""
 
 
 class AI:
-    def __init__(self, color, difficulty=2):
+    def __init__(self, color, difficulty=2, backend="board", tt_size_mb=DEFAULT_SIZE_MB,
+                 tt_replacement=REPLACE_DEPTH, time_budget_ms=None, workers=1, seed=None,
+                 eval_weights=None, book_path=None, tablebase_path=None, move_ordering=True,
+                 collect_stats=False, quiescence_nodes=QUIESCENCE_NODE_LIMIT, mandatory_capture=False,
+                 depth=None):
         """
         Initialize the AI player.
 
@@ -18,9 +53,115 @@ class AI:
                 3: Medium (depth 3)
                 4: Hard (depth 4)
                 5: Very Hard (depth 5)
+            backend: "board" to search on copies of the game Board, or
+                "bitboard" to search on a compact BitBoard position
+            tt_size_mb: Memory cap of the transposition table in megabytes (0 disables it)
+            tt_replacement: Transposition table replacement policy ("depth" or "always")
+            time_budget_ms: If set, ignore the difficulty depth and search with
+                iterative deepening until this many milliseconds have passed
+            workers: Number of processes to split the root moves across (1 searches in this process)
+            seed: Seed for the random moves made at difficulty 1, for reproducible games
+            eval_weights: Overrides for DEFAULT_EVAL_WEIGHTS used by evaluate_board
+            book_path: Opening book file consulted before searching (see engine/book.py)
+            tablebase_path: Endgame tablebase probed instead of searching positions
+                with few enough pieces (see engine/tablebase.py)
+            move_ordering: Order moves inside the search with killer moves and the
+                history heuristic (False keeps board-scan order, jumps first per piece)
+            collect_stats: Record a SearchStats for every get_move call in self.stats
+                and log it (see engine/stats.py)
+            quiescence_nodes: Most nodes of the capture-only search run at each horizon
+                position before it is evaluated (0 evaluates the horizon directly)
+            mandatory_capture: Play by the standard rule that a capture must be made
+                when one is available (the game must use the same rule)
+            depth: Search depth to use instead of the difficulty level's, with no
+                upper limit (reset by set_difficulty)
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown AI backend: {backend}")
+        if mandatory_capture and tablebase_path:
+            raise ValueError("Tablebases are built for optional captures and can't be used with mandatory_capture")
+
+        self.mandatory_capture = mandatory_capture
+
         self.color = color
+        self.backend = backend
+        self.workers = max(1, workers)
+        self.seed = seed
+        self.random = random.Random(seed)
+
+        self.book_path = book_path
+        self.book = OpeningBook(book_path) if book_path else None
+
+        self.tablebase_path = tablebase_path
+        self.tablebase = Tablebase(tablebase_path) if tablebase_path else None
+        self.tablebase_hits = 0  # Positions scored from the tablebase by the current or last search
+
+        self.eval_weights = dict(DEFAULT_EVAL_WEIGHTS, **(eval_weights or {}))
+        self._eval_tables = evaluation_tables(self.eval_weights)
+        # Board keeps a running evaluation, but only for the default weights
+        self._use_board_evaluation = self.eval_weights == DEFAULT_EVAL_WEIGHTS
+
+        # Killer/history move ordering, kept between moves like the transposition table
+        self.ordering = MoveOrderer() if move_ordering else None
+
+        # Process pool for parallel root search, started on first use
+        self._parallel = None
+
+        # When True only transposition table entries of exactly the searched depth are used,
+        # so a position's score never depends on what else was searched before it
+        self.tt_exact_depth = False
+
+        # The table is kept between moves so later searches reuse earlier work
+        self.tt = TranspositionTable(tt_size_mb, tt_replacement) if tt_size_mb > 0 else None
+
+        self.time_budget_ms = time_budget_ms
+        self.depth_reached = 0  # Depth of the last completed search
+        self.deadline = None  # time.perf_counter() value at which the search is abandoned
+        self.nodes = 0  # Nodes visited by the current or last search
+
+        # Capture sequences are searched past the horizon until the position is quiet
+        self.quiescence_nodes = quiescence_nodes
+        self.qnodes = 0  # Of self.nodes, the ones visited by the quiescence search
+        self.quiescence_limit_hits = 0  # Quiescence nodes evaluated early because the node limit ran out
+        self._quiescence_budget = 0
+
+        # Statistics of the current or last get_move call; stays None unless collect_stats is set,
+        # so the search only pays for a None check when they are off
+        self.collect_stats = collect_stats
+        self.stats = None
+
+        # Optional callable polled during the search; returning True aborts it
+        self.should_stop = None
+
+        # Principal variation (move keys by ply) from the last completed iteration,
+        # and the table the current iteration builds it in
+        self._prev_pv = []
+        self._pv_table = {}
+
         self.set_difficulty(difficulty)
+        if depth is not None:
+            self.depth = max(1, depth)
+
+    def settings(self):
+        """Constructor arguments that rebuild an equivalent AI, e.g. in another process"""
+        return {
+            "color": self.color,
+            "difficulty": self.difficulty,
+            "depth": self.depth,
+            "backend": self.backend,
+            "tt_size_mb": self.tt.size_mb if self.tt is not None else 0,
+            "tt_replacement": self.tt.replacement if self.tt is not None else REPLACE_DEPTH,
+            "time_budget_ms": self.time_budget_ms,
+            "workers": self.workers,
+            "seed": self.seed,
+            "eval_weights": self.eval_weights,
+            "book_path": self.book_path,
+            "tablebase_path": self.tablebase_path,
+            "move_ordering": self.ordering is not None,
+            "collect_stats": self.collect_stats,
+            "quiescence_nodes": self.quiescence_nodes,
+            "mandatory_capture": self.mandatory_capture,
+        }
 
     def set_difficulty(self, difficulty):
         """Set the AI difficulty level (1-5)"""
@@ -40,152 +181,547 @@ class AI:
         Returns:
             tuple: (piece, move) where piece is the Piece to move and move is the (row, col) to move to
         """
-        # Make a deep copy of the board to avoid modifying the actual game
-        board = deepcopy(game.board)
-
+        if not self.collect_stats:
+            return self._find_move(game)
+
+        stats = self.stats = SearchStats(self.color)
+        tt_probes, tt_hits = (self.tt.probes, self.tt.hits) if self.tt is not None else (0, 0)
+        start = time.perf_counter()
+        try:
+            return self._find_move(game)
+        finally:
+            stats.elapsed = time.perf_counter() - start
+            stats.nodes = self.nodes
+            stats.qnodes = self.qnodes
+            stats.quiescence_limit_hits = self.quiescence_limit_hits
+            stats.depth_reached = self.depth_reached
+            stats.tablebase_hits = self.tablebase_hits
+            if self.tt is not None:
+                # Added to the probes of any worker processes
+                stats.tt_probes += self.tt.probes - tt_probes
+                stats.tt_hits += self.tt.hits - tt_hits
+            stats.log()
+
+    def _find_move(self, game):
+        """get_move without the statistics bookkeeping"""
         # Check if we should make a random move (for very easy difficulty)
-        if self.difficulty == 1 and random.random() < self.random_move_chance:
+        if self.difficulty == 1 and self.random.random() < self.random_move_chance:
+            if self.stats is not None:
+                self.stats.source = "random"
+            self.nodes = self.qnodes = self.quiescence_limit_hits = 0
+            self.depth_reached = 0
             return self.get_random_move(game)
 
-        # Get all possible pieces that can be moved
-        valid_pieces = []
-        for row in range(len(board.board)):
-            for col in range(len(board.board[row])):
-                piece = board.get_piece(row, col)
-                if piece and piece.color == self.color:
-                    moves = board.get_valid_moves(piece)
-                    if moves:
-                        valid_pieces.append((piece, moves))
+        # Play from the opening book while the position is in it
+        if self.book is not None:
+            book_move = self._book_move(game)
+            if book_move:
+                if self.stats is not None:
+                    self.stats.source = "book"
+                return book_move
 
-        if not valid_pieces:
+        # Search a single private copy of the board, making and unmaking moves in place
+        board = self._search_board(game)
+
+        # Get all possible moves, jumps first to improve alpha-beta pruning
+        moves = self._ordered_moves(board, self.color)
+        if not moves:
             return None
 
-        # Find the best move using minimax with alpha-beta pruning
-        best_value = float('-inf') if self.color == RED else float('inf')
-        best_move = None
+        if self.tt is not None:
+            self.tt.new_search()
+        if self.ordering is not None:
+            self.ordering.new_search()
+        self.nodes = self.qnodes = self.quiescence_limit_hits = 0
+        self.tablebase_hits = 0
+        self._prev_pv = []
+
+        if self.time_budget_ms is None:
+            best_value, best_key = self._search_root(board, moves, self.depth)
+            self.depth_reached = self.depth
+        else:
+            best_key = self._iterative_deepening(board, moves)
+
+        # Return the actual game piece and move, not the search ones
+        return self._to_game_move(game, best_key)
+
+    def _book_move(self, game):
+        """Pick one of the book's moves for this position, weighted by how good the book rates them"""
+        legal = {((piece.row, piece.col), move)
+                 for piece, move, skipped in game.board.get_all_moves(self.color, self.mandatory_capture)}
+        candidates = [(start, end, weight) for start, end, weight in self.book.probe(game.board, self.color)
+                      if (start, end) in legal]
+        if not candidates:
+            return None
+
+        self.nodes = self.qnodes = self.quiescence_limit_hits = 0
+        self.depth_reached = 0
+        start, end, weight = self.random.choices(candidates, weights=[weight for start, end, weight in candidates])[0]
+        return game.board.get_piece(*start), end
+
+    def _iterative_deepening(self, board, moves):
+        """
+        Search depth 1, 2, 3, ... until the time budget runs out.
+        Returns:
+            The move key of the best move from the deepest completed iteration
+        """
+        self.deadline = time.perf_counter() + self.time_budget_ms / 1000
+        self.depth_reached = 0
+
+        # If not even depth 1 completes, fall back to the first ordered move
+        piece, move, skipped = moves[0]
+        best_key = self._move_key(piece, move)
+        best_value = None
+
+        try:
+            for depth in range(1, MAX_SEARCH_DEPTH + 1):
+                try:
+                    best_value, best_key = self._aspiration_search(board, moves, depth, best_value)
+                except SearchTimeout:
+                    break
+
+                self.depth_reached = depth
+                # Next iteration starts from this iteration's principal variation
+                self._prev_pv = self._pv_table.get(0, [])
+
+                # Stop early once a forced win or loss is found
+                if abs(best_value) >= 1000 or time.perf_counter() >= self.deadline:
+                    break
+        finally:
+            self.deadline = None
 
-        # Sort moves to improve alpha-beta pruning effectiveness
-        # For capturing moves, try them first
-        for piece, moves in valid_pieces:
-            # Sort moves by number of pieces captured (try jumps first)
-            sorted_moves = sorted(moves.items(),
-                                  key=lambda x: len(x[1]),
-                                  reverse=True)
+        return best_key
 
-            for move, skipped in sorted_moves:
-                # Create a simulation board
-                temp_board = deepcopy(board)
-                temp_piece = temp_board.get_piece(piece.row, piece.col)
+    def _aspiration_search(self, board, moves, depth, previous):
+        """
+        Search the root with a narrow window around the previous iteration's
+        score, falling back to a full window if the score lands outside it.
+        Returns:
+            tuple: (best value, move key of the best move)
+        """
+        if previous is None or self.workers > 1:
+            return self._search_root(board, moves, depth)
 
-                # Simulate the move
-                temp_board.move(temp_piece, move[0], move[1])
-                if skipped:
-                    temp_board.remove(skipped)
+        alpha, beta = previous - ASPIRATION_WINDOW, previous + ASPIRATION_WINDOW
+        best_value, best_key = self._search_root(board, moves, depth, alpha, beta)
+        if alpha < best_value < beta:
+            return best_value, best_key
+        return self._search_root(board, moves, depth)
 
-                # Use minimax to evaluate this move
-                value = self.minimax(temp_board, self.depth - 1, float('-inf'), float('inf'), self.color != RED)
+    def _search_root(self, board, moves, depth, alpha=float('-inf'), beta=float('inf')):
+        """
+        Alpha-beta search of the root moves to the given depth. The best score
+        so far narrows the window of every later move, so moves that cannot
+        beat it are refuted without an exact score.
+        Returns:
+            tuple: (best value, move key of the best move). The value is exact
+            if it lies inside (alpha, beta), otherwise only a bound.
+        """
+        key = self._tt_key(board, self.color == RED)
+        moves = self._pv_move_first(moves, 0)
+        if self.tt is not None:
+            entry = self.tt.probe(key)
+            if entry:
+                moves = self._move_first(moves, entry[3])
+        self._pv_table = {}
 
-                # Update best move if needed
-                if (self.color == RED and value > best_value) or (self.color == WHITE and value < best_value):
-                    best_value = value
+        if self.workers > 1 and len(moves) > 1:
+            return self._search_root_parallel(board, moves, depth, key)
 
-                    # Store the actual game piece and move, not the temp ones
-                    best_move = (game.board.get_piece(piece.row, piece.col), move)
+        # Find the best move using minimax with alpha-beta pruning
+        alpha_orig, beta_orig = alpha, beta
+        best_value = float('-inf') if self.color == RED else float('inf')
+        best_key = None
+
+        for piece, move, skipped in moves:
+            # Use minimax to evaluate this move
+            value = self.search_root_move(board, piece, move, skipped, depth, alpha, beta)
+
+            # Update best move if needed; a later move that only ties the best fails low and is never picked
+            if (self.color == RED and value > best_value) or (self.color == WHITE and value < best_value):
+                best_value = value
+                best_key = self._move_key(piece, move)
+                self._pv_table[0] = [best_key] + self._pv_table.get(1, [])
+
+            if self.color == RED:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if beta <= alpha:
+                break
 
-        return best_move
+        if self.tt is not None:
+            if best_value <= alpha_orig:
+                bound = UPPER
+            elif best_value >= beta_orig:
+                bound = LOWER
+            else:
+                bound = EXACT
+            self.tt.store(key, depth, bound, best_value, best_key)
+
+        return best_value, best_key
+
+    def _search_root_parallel(self, board, moves, depth, key):
+        """_search_root with the root moves split across worker processes"""
+        if self._parallel is None:
+            from engine.parallel import ParallelRootSearch
+            self._parallel = ParallelRootSearch(self.workers)
+
+        remaining = None
+        if self.deadline is not None:
+            remaining = self.deadline - time.perf_counter()
+        should_stop = self.should_stop if self.should_stop is not None else lambda: False
+
+        best_value, best_index, stats = self._parallel.search(self, board, moves, depth, remaining, should_stop)
+        self.nodes += stats.nodes
+        self.qnodes += stats.qnodes
+        self.quiescence_limit_hits += stats.quiescence_limit_hits
+        self.tablebase_hits += stats.tablebase_hits
+        if self.stats is not None:
+            # The rest of the workers' counters; get_move fills in the ones above
+            self.stats.leaf_evals += stats.leaf_evals
+            self.stats.beta_cutoffs += stats.beta_cutoffs
+            self.stats.tt_probes += stats.tt_probes
+            self.stats.tt_hits += stats.tt_hits
+            self.stats.max_ply = max(self.stats.max_ply, stats.max_ply)
+        if best_index is None:
+            raise SearchTimeout()
+
+        piece, move, skipped = moves[best_index]
+        best_key = self._move_key(piece, move)
+        self._pv_table[0] = [best_key]
+        if self.tt is not None:
+            self.tt.store(key, depth, EXACT, best_value, best_key)
+
+        return best_value, best_key
+
+    def search_root_move(self, board, piece, move, skipped, depth, alpha, beta):
+        """
+        Score one root move: make it, search the reply to depth - 1 and unmake it.
+        Returns:
+            float: The minimax score of the move
+        """
+        undo = board.make_move(piece, move, skipped)
+        try:
+            return self.minimax(board, depth - 1, alpha, beta, self.color != RED, ply=1)
+        finally:
+            board.unmake_move(undo)
+
+    def close(self):
+        """Shut down the worker processes used for parallel search and close the opening book and tablebase"""
+        if self._parallel is not None:
+            self._parallel.shutdown()
+            self._parallel = None
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+        if self.tablebase is not None:
+            self.tablebase.close()
+            self.tablebase = None
+
+    def _search_board(self, game):
+        """Return a copy of the game board in the representation used for searching"""
+        if self.backend == "bitboard":
+            return BitBoard.from_board(game.board)
+        return deepcopy(game.board)
+
+    def _to_game_move(self, game, move_key):
+        """Translate a search move key into (game piece, (row, col))"""
+        start, move = move_key
+        if self.backend == "bitboard":
+            return game.board.get_piece(*square_to_rowcol(start)), square_to_rowcol(move)
+        return game.board.get_piece(*start), move
+
+    def _move_key(self, piece, move):
+        """Identify a move by its squares so it stays valid across board copies"""
+        if self.backend == "bitboard":
+            return piece, move
+        return (piece.row, piece.col), move
+
+    def _tt_key(self, board, is_maximizing):
+        """Transposition table key: the board's Zobrist key plus the side to move"""
+        return board.zobrist_key if is_maximizing else board.zobrist_key ^ SIDE_KEY
+
+    def _move_first(self, moves, move_key):
+        """Move the move with the given key (if present) to the front of the list"""
+        if move_key is None:
+            return moves
+        for i, entry in enumerate(moves):
+            if self._move_key(entry[0], entry[1]) == move_key:
+                return [moves[i]] + moves[:i] + moves[i + 1:]
+        return moves
+
+    def _pv_move_first(self, moves, ply):
+        """Try the previous iteration's principal variation move for this ply first"""
+        if ply < len(self._prev_pv):
+            return self._move_first(moves, self._prev_pv[ply])
+        return moves
+
+    def _ordered_moves(self, board, color):
+        """
+        Get every move for one side in search order: board-scan order, with
+        each piece's jumps tried first. Under mandatory capture only captures
+        are returned when there are any.
+        Returns:
+            list: (piece, move, skipped) tuples
+        """
+        if isinstance(board, BitBoard):
+            moves = board.get_all_moves(color, self.mandatory_capture)
+            moves.sort(key=lambda x: (x[0], -x[2].bit_count()))
+            return moves
+
+        # Sort each piece's moves by number of pieces captured (try jumps first)
+        moves = board.get_all_moves(color, self.mandatory_capture)
+        moves.sort(key=lambda x: (x[0].row, x[0].col, -len(x[2])))
+        return moves
+
+    def _capture_count(self, skipped):
+        """Number of pieces a move captures"""
+        if self.backend == "bitboard":
+            return skipped.bit_count()
+        return len(skipped)
 
     def get_random_move(self, game):
         """Get a random valid move for the AI (used for very easy difficulty)"""
-        board = game.board
-        valid_moves = []
-
-        for row in range(len(board.board)):
-            for col in range(len(board.board[row])):
-                piece = board.get_piece(row, col)
-                if piece and piece.color == self.color:
-                    moves = board.get_valid_moves(piece)
-                    for move in moves:
-                        valid_moves.append((piece, move))
+        valid_moves = [(piece, move) for piece, move, skipped in
+                       game.board.get_all_moves(self.color, self.mandatory_capture)]
 
         if valid_moves:
-            return random.choice(valid_moves)
+            return self.random.choice(valid_moves)
         return None
 
-    def minimax(self, board, depth, alpha, beta, is_maximizing):
+    def minimax(self, board, depth, alpha, beta, is_maximizing, ply=0):
         """
         Minimax algorithm with alpha-beta pruning to find the best move.
+        Moves are made and unmade on the given board, which is left unchanged.
         Parameters:
-            board: Board object representing current state
+            board: Board or BitBoard representing current state
             depth: Current depth in the search tree
             alpha: Alpha value for pruning
             beta: Beta value for pruning
             is_maximizing: Boolean indicating if maximizing (RED) or minimizing (WHITE)
+            ply: Distance from the root, used to follow the principal variation
         Returns:
             float: The evaluated score of the board position
         """
+        self._pv_table[ply] = []
+
         # Check for terminal state or maximum depth
-        winner = board.winner()
-        if winner == RED:
-            return 1000  # RED wins
-        elif winner == WHITE:
-            return -1000  # WHITE wins
-        elif depth == 0:
+        score = self._enter_node(board, ply)
+        if score is not None:
+            return score
+        stats = self.stats
+
+        # Endgames with few enough pieces are looked up rather than searched
+        if (self.tablebase is not None and ply > 0
+                and board.red_pieces + board.white_pieces <= self.tablebase.max_pieces):
+            score = self._tablebase_score(board, is_maximizing)
+            if score is not None:
+                return score
+
+        if depth == 0:
+            if stats is not None:
+                stats.leaf_evals += 1
+            if self.quiescence_nodes:
+                # Play out pending captures so the evaluation isn't taken mid-exchange
+                self._quiescence_budget = self.quiescence_nodes
+                return self.quiescence(board, alpha, beta, is_maximizing, ply)
             return self.evaluate_board(board)
 
+        # Look the position up in the transposition table
+        tt_move = None
+        if self.tt is not None:
+            key = self._tt_key(board, is_maximizing)
+            entry = self.tt.probe(key)
+            if entry:
+                tt_depth, bound, score, tt_move = entry
+                if tt_depth == depth or (tt_depth > depth and not self.tt_exact_depth):
+                    if bound == EXACT:
+                        return score
+                    elif bound == LOWER:
+                        alpha = max(alpha, score)
+                    elif bound == UPPER:
+                        beta = min(beta, score)
+                    if beta <= alpha:
+                        return score
+        alpha_orig, beta_orig = alpha, beta
+
         # Get all possible moves for the current player
         current_color = RED if is_maximizing else WHITE
         max_value = float('-inf') if is_maximizing else float('inf')
 
-        # Find all pieces that can move
-        valid_pieces = []
-        for row in range(len(board.board)):
-            for col in range(len(board.board[row])):
-                piece = board.get_piece(row, col)
-                if piece and piece.color == current_color:
-                    moves = board.get_valid_moves(piece)
-                    if moves:
-                        # Sort moves with jumps first to improve pruning
-                        sorted_moves = sorted(moves.items(),
-                                              key=lambda x: len(x[1]),
-                                              reverse=True)
-                        valid_pieces.append((piece, sorted_moves))
-
-        # If no valid moves, it's a draw (or the other player wins in checkers)
-        if not valid_pieces:
-            return 0 if is_maximizing else 0
-
-        for piece, moves in valid_pieces:
-            for move, skipped in moves:
-                # Create a simulation board
-                temp_board = deepcopy(board)
-                temp_piece = temp_board.get_piece(piece.row, piece.col)
-
-                # Simulate the move
-                temp_board.move(temp_piece, move[0], move[1])
-                if skipped:
-                    temp_board.remove(skipped)
-
-                # Recursively evaluate this position
-                value = self.minimax(temp_board, depth - 1, alpha, beta, not is_maximizing)
-
-                # Update value based on min/max
-                if is_maximizing:
-                    max_value = max(max_value, value)
-                    alpha = max(alpha, max_value)
-                else:
-                    max_value = min(max_value, value)
-                    beta = min(beta, max_value)
-
-                # Alpha-beta pruning
-                if beta <= alpha:
-                    break
-
-            # If we've pruned, no need to check other pieces
+        moves = self._ordered_moves(board, current_color)
+
+        # A side with no legal moves has lost, as in the tablebase
+        if not moves:
+            return -1000 if is_maximizing else 1000
+
+        entries = [(piece, move, skipped, self._move_key(piece, move), self._capture_count(skipped))
+                   for piece, move, skipped in moves]
+        if self.ordering is not None:
+            self.ordering.order(entries, ply)
+
+        # Try the best move from an earlier search of this position first,
+        # and ahead of it the previous iteration's principal variation move
+        entries = self._pv_move_first(self._move_first(entries, tt_move), ply)
+        best_key = None
+
+        for index, (piece, move, skipped, move_key, captures) in enumerate(entries):
+            # Simulate the move
+            undo = board.make_move(piece, move, skipped)
+
+            # Recursively evaluate this position
+            value = self.minimax(board, depth - 1, alpha, beta, not is_maximizing, ply + 1)
+
+            board.unmake_move(undo)
+
+            # Update value based on min/max
+            if is_maximizing:
+                if value > max_value:
+                    max_value = value
+                    best_key = move_key
+                    self._pv_table[ply] = [best_key] + self._pv_table.get(ply + 1, [])
+                alpha = max(alpha, max_value)
+            else:
+                if value < max_value:
+                    max_value = value
+                    best_key = move_key
+                    self._pv_table[ply] = [best_key] + self._pv_table.get(ply + 1, [])
+                beta = min(beta, max_value)
+
+            # Alpha-beta pruning
             if beta <= alpha:
+                if stats is not None:
+                    stats.beta_cutoffs += 1
+                if self.ordering is not None:
+                    self.ordering.record_cutoff(move_key, captures, ply, depth, index)
                 break
 
+        if self.tt is not None:
+            if max_value <= alpha_orig:
+                bound = UPPER
+            elif max_value >= beta_orig:
+                bound = LOWER
+            else:
+                bound = EXACT
+            self.tt.store(key, depth, bound, max_value, best_key)
+
         return max_value
 
+    def quiescence(self, board, alpha, beta, is_maximizing, ply):
+        """
+        Search only capture moves from a horizon position until it is quiet.
+        When captures are optional the side to move may always stand pat on
+        the static evaluation instead of capturing; under mandatory capture it
+        can only do so in a position without captures.
+        Parameters:
+            board: Board or BitBoard representing current state
+            alpha: Alpha value for pruning
+            beta: Beta value for pruning
+            is_maximizing: Boolean indicating if maximizing (RED) or minimizing (WHITE)
+            ply: Distance from the root
+        Returns:
+            float: The evaluated score of the board position
+        """
+        self.qnodes += 1
+        score = self._enter_node(board, ply)
+        if score is not None:
+            return score
+
+        # Stand pat: the score if the side to move makes a quiet move instead
+        stand_pat = self.evaluate_board(board)
+        if self._quiescence_budget <= 0:
+            self.quiescence_limit_hits += 1
+            return stand_pat
+        self._quiescence_budget -= 1
+
+        if self.mandatory_capture:
+            # A capture has to be made if there is one, so there is no standing pat yet
+            best_value = float('-inf') if is_maximizing else float('inf')
+        else:
+            if is_maximizing:
+                if stand_pat >= beta:
+                    return stand_pat
+                alpha = max(alpha, stand_pat)
+            else:
+                if stand_pat <= alpha:
+                    return stand_pat
+                beta = min(beta, stand_pat)
+            best_value = stand_pat
+
+        # With the capture rule applied, only captures are generated when there are
+        # any; the quiet moves are only needed to tell a quiet position from one
+        # where the side to move has no legal moves and has lost, as in minimax
+        current_color = RED if is_maximizing else WHITE
+        moves = board.get_all_moves(current_color, mandatory_capture=True)
+        if not moves:
+            return -1000 if is_maximizing else 1000
+        if not moves[0][2]:
+            return stand_pat  # Quiet
+
+        # Biggest captures first
+        captures = [(self._capture_count(skipped), piece, move, skipped) for piece, move, skipped in moves]
+        captures.sort(key=lambda entry: -entry[0])
+
+        for count, piece, move, skipped in captures:
+            undo = board.make_move(piece, move, skipped)
+            value = self.quiescence(board, alpha, beta, not is_maximizing, ply + 1)
+            board.unmake_move(undo)
+
+            if is_maximizing:
+                best_value = max(best_value, value)
+                alpha = max(alpha, best_value)
+            else:
+                best_value = min(best_value, value)
+                beta = min(beta, best_value)
+            if beta <= alpha:
+                break
+
+        return best_value
+
+    def _enter_node(self, board, ply):
+        """
+        Start visiting a minimax or quiescence node: count it, check the time
+        budget and cancellation every so often, and score finished games.
+        Returns:
+            float: The score if the game is over, otherwise None
+        """
+        self.nodes += 1
+        stats = self.stats
+        if stats is not None and ply > stats.max_ply:
+            stats.max_ply = ply
+        if self.nodes % TIME_CHECK_INTERVAL == 0:
+            if ((self.deadline is not None and time.perf_counter() >= self.deadline)
+                    or (self.should_stop is not None and self.should_stop())):
+                raise SearchTimeout()
+
+        winner = board.winner()
+        if winner == RED:
+            return 1000  # RED wins
+        elif winner == WHITE:
+            return -1000  # WHITE wins
+        return None
+
+    def _tablebase_score(self, board, is_maximizing):
+        """
+        Score a position from the tablebase, preferring quicker wins and slower losses.
+        Returns:
+            float: Score from RED's point of view, or None if the tablebase does not cover it
+        """
+        entry = self.tablebase.probe(board, is_maximizing)
+        if entry is None:
+            return None
+        self.tablebase_hits += 1
+
+        result, distance = entry
+        if result == WIN:
+            score = TABLEBASE_WIN_SCORE - distance
+        elif result == LOSS:
+            score = distance - TABLEBASE_WIN_SCORE
+        else:
+            score = 0
+        return score if is_maximizing else -score
+
     def evaluate_board(self, board):
         """
         Evaluate the current board state and return a score.
@@ -196,7 +732,20 @@ class AI:
         2. King advantage (kings are worth more)
         3. Position advantage (pieces closer to becoming kings)
         4. Center control
+
+        With the default weights a Board's running evaluation is used, so a
+        leaf costs O(1); other weights fall back to scan_evaluation.
         """
+        if isinstance(board, BitBoard):
+            return board.evaluate(self._eval_tables)
+        if self._use_board_evaluation:
+            return board.evaluation
+
+        return self.scan_evaluation(board)
+
+    def scan_evaluation(self, board):
+        """Compute evaluate_board's score by visiting every square of a Board"""
+        weights = self.eval_weights
         red_score = 0
         white_score = 0
 
@@ -205,21 +754,21 @@ class AI:
                 piece = board.get_piece(row, col)
                 if piece:
                     # Base piece value
-                    piece_value = 10
+                    piece_value = weights["man"]
 
                     # Kings are worth more
                     if piece.king:
-                        piece_value = 15
+                        piece_value = weights["king"]
 
                     # Pieces closer to becoming kings are worth more
                     elif piece.color == RED and row < 3:
-                        piece_value += 3 - row  # 0-2 bonus based on proximity to king row
+                        piece_value += weights["advance"] * (3 - row)  # 0-2 bonus based on proximity to king row
                     elif piece.color == WHITE and row > 4:
-                        piece_value += row - 4  # 1-3 bonus based on proximity to king row
+                        piece_value += weights["advance"] * (row - 4)  # 1-3 bonus based on proximity to king row
 
                     # Center control bonus (pieces in the center 4x4 area)
                     if 2 <= row <= 5 and 2 <= col <= 5:
-                        piece_value += 1
+                        piece_value += weights["center"]
 
                     # Add to appropriate score
                     if piece.color == RED:
@@ -0,0 +1,111 @@
+# evaluation.py - Check that every implementation of the evaluation heuristic gives the same score
+#
+# Run from the project root:
+#   python -m benchmarks.evaluation
+#
+# Plays seeded random games on a Board and a BitBoard side by side, and at every
+# position compares the running scores of Board and BitBoard with full rescans and
+# AI.scan_evaluation, also after making and unmaking each legal move.
+# Exits with status 1 if any of them disagree.
+
+import random
+import sys
+
+from ai_player import AI
+from components.bitboard import BitBoard, rowcol_to_square, evaluation_tables, SQUARE_MASKS
+from components.board import Board
+from utils.constants import RED, WHITE
+
+GAME_SEEDS = range(40)
+MAX_PLIES = 150
+
+# Non-default weights, which Board's running evaluation does not cover
+OTHER_WEIGHTS = {"man": 7, "king": 19, "advance": 3, "center": 2}
+
+# Disagreements printed before the rest are only counted
+MAX_REPORTS = 20
+
+
+def _bitboard_move(piece, move, skipped):
+    # The same move as Board's (piece, (row, col), skipped) in BitBoard's terms
+    captured = 0
+    for captured_piece in skipped:
+        captured |= SQUARE_MASKS[rowcol_to_square(captured_piece.row, captured_piece.col)]
+    return rowcol_to_square(piece.row, piece.col), rowcol_to_square(*move), captured
+
+
+class EvaluationCheck:
+    def __init__(self):
+        self.default_ai = AI(RED, tt_size_mb=0, move_ordering=False)
+        self.other_ai = AI(RED, tt_size_mb=0, move_ordering=False, eval_weights=OTHER_WEIGHTS)
+        self.other_tables = evaluation_tables(self.other_ai.eval_weights)
+        self.positions = 0
+        self.failures = 0
+
+    def compare(self, board, bitboard, where):
+        """Compare every evaluation of one position, reporting any disagreement"""
+        self.positions += 1
+        scores = {
+            "Board.evaluation": board.evaluation,
+            "Board.compute_evaluation": board.compute_evaluation(),
+            "AI.scan_evaluation": self.default_ai.scan_evaluation(board),
+            "BitBoard.evaluate": bitboard.evaluate(),
+            "BitBoard.compute_evaluation": bitboard.compute_evaluation(),
+            "BitBoard.from_board": BitBoard.from_board(board).evaluate(),
+        }
+        other_scores = {
+            "AI.scan_evaluation": self.other_ai.scan_evaluation(board),
+            "BitBoard.evaluate": bitboard.evaluate(self.other_tables),
+        }
+        reports = [f"  {where}, {label}: " + ", ".join(f"{name} {value}" for name, value in values.items())
+                   for label, values in (("default weights", scores), ("other weights", other_scores))
+                   if len(set(values.values())) > 1]
+        if reports:
+            self.failures += 1
+            if self.failures <= MAX_REPORTS:
+                print("\n".join(reports), file=sys.stderr)
+
+    def play(self, seed):
+        """Play one random game, checking every position and every move's round trip"""
+        rng = random.Random(seed)
+        board = Board()
+        bitboard = BitBoard.from_board(board)
+        color = RED
+        for ply in range(MAX_PLIES):
+            where = f"seed {seed} ply {ply}"
+            self.compare(board, bitboard, where)
+
+            moves = board.get_all_moves(color)
+            if not moves:
+                break
+
+            # Make and unmake every legal move on both boards
+            for piece, move, skipped in moves:
+                label = f"{(piece.row, piece.col)}-{move}"
+                bitboard_move = _bitboard_move(piece, move, skipped)
+                undo = board.make_move(piece, move, skipped)
+                bitboard_undo = bitboard.make_move(*bitboard_move)
+                self.compare(board, bitboard, f"{where} after {label}")
+                board.unmake_move(undo)
+                bitboard.unmake_move(bitboard_undo)
+                self.compare(board, bitboard, f"{where} undoing {label}")
+
+            piece, move, skipped = rng.choice(moves)
+            bitboard.make_move(*_bitboard_move(piece, move, skipped))
+            board.make_move(piece, move, skipped)
+            color = WHITE if color == RED else RED
+
+
+def main():
+    check = EvaluationCheck()
+    for seed in GAME_SEEDS:
+        check.play(seed)
+
+    print(f"{len(GAME_SEEDS)} games, {check.positions} positions compared, {check.failures} disagreed")
+    if check.failures:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+# movegen.py - Benchmark of Board's move generator against the original recursive one
+#
+# Run from the project root:
+#   python -m benchmarks.movegen
+
+import random
+import time
+from copy import deepcopy
+
+from components.board import Board
+from utils.constants import ROWS, COLS, RED, WHITE
+
+# Random games used to build the fixed position set (same seeds, same positions)
+POSITION_SEEDS = range(8)
+POSITION_PLIES = (0, 8, 16, 24, 32, 48, 64)
+REPEATS = 200
+
+
+class RecursiveMoveGenerator:
+    """The original recursive _traverse_left/_traverse_right generator, kept as a reference"""
+
+    def __init__(self, board):
+        self.board = board
+
+    def get_valid_moves(self, piece):
+        moves = {}
+        left = piece.col - 1
+        right = piece.col + 1
+        row = piece.row
+
+        # Different move directions based on color and king status
+        if piece.color == RED or piece.king:
+            # Moving upward (red pieces and kings)
+            moves.update(self._traverse_left(row - 1, max(row - 3, -1), -1, piece.color, left))
+            moves.update(self._traverse_right(row - 1, max(row - 3, -1), -1, piece.color, right))
+
+        if piece.color == WHITE or piece.king:
+            # Moving downward (white pieces and kings)
+            moves.update(self._traverse_left(row + 1, min(row + 3, ROWS), 1, piece.color, left))
+            moves.update(self._traverse_right(row + 1, min(row + 3, ROWS), 1, piece.color, right))
+
+        return moves
+
+    def _traverse_left(self, start, stop, step, color, left, skipped=None):
+        if skipped is None:
+            skipped = []
+
+        moves = {}
+        last = []
+
+        for r in range(start, stop, step):
+            if left < 0:
+                break
+
+            current = self.board.get_piece(r, left)
+            if current is None:
+                if skipped and not last:
+                    break
+                elif skipped:
+                    moves[(r, left)] = last + skipped
+                else:
+                    moves[(r, left)] = last
+
+                if last:
+                    if step == -1:
+                        row = max(r - 3, -1)
+                    else:
+                        row = min(r + 3, ROWS)
+                    moves.update(self._traverse_left(r + step, row, step, color, left - 1, skipped=last))
+                    moves.update(self._traverse_right(r + step, row, step, color, left + 1, skipped=last))
+                break
+            elif current.color == color:
+                break
+            else:
+                last = [current]
+
+            left -= 1
+
+        return moves
+
+    def _traverse_right(self, start, stop, step, color, right, skipped=None):
+        if skipped is None:
+            skipped = []
+
+        moves = {}
+        last = []
+
+        for r in range(start, stop, step):
+            if right >= COLS:
+                break
+
+            current = self.board.get_piece(r, right)
+            if current is None:
+                if skipped and not last:
+                    break
+                elif skipped:
+                    moves[(r, right)] = last + skipped
+                else:
+                    moves[(r, right)] = last
+
+                if last:
+                    if step == -1:
+                        row = max(r - 3, -1)
+                    else:
+                        row = min(r + 3, ROWS)
+                    moves.update(self._traverse_left(r + step, row, step, color, right - 1, skipped=last))
+                    moves.update(self._traverse_right(r + step, row, step, color, right + 1, skipped=last))
+                break
+            elif current.color == color:
+                break
+            else:
+                last = [current]
+
+            right += 1
+
+        return moves
+
+
+def fixed_positions():
+    """Positions reached by seeded random play, as (label, Board) pairs"""
+    positions = []
+    for seed in POSITION_SEEDS:
+        rng = random.Random(seed)
+        board = Board()
+        color = RED
+        for ply in range(max(POSITION_PLIES) + 1):
+            if ply in POSITION_PLIES:
+                positions.append((f"seed {seed} ply {ply}", board))
+                board = deepcopy(board)
+            moves = board.get_all_moves(color)
+            if not moves:
+                break
+            piece, move, skipped = rng.choice(moves)
+            board.make_move(piece, move, skipped)
+            color = WHITE if color == RED else RED
+    return positions
+
+
+def _time(generate, pieces):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for piece in pieces:
+            generate(piece)
+    return time.perf_counter() - start
+
+
+def main():
+    positions = fixed_positions()
+    total_old = total_new = 0
+
+    print(f"{'position':<20}{'pieces':>8}{'moves':>8}{'recursive ms':>15}{'tables ms':>12}{'speedup':>10}")
+    for label, board in positions:
+        reference = RecursiveMoveGenerator(board)
+        pieces = list(board.pieces(RED)) + list(board.pieces(WHITE))
+
+        # Both generators must produce identical move dicts
+        move_count = 0
+        for piece in pieces:
+            expected = reference.get_valid_moves(piece)
+            actual = board.get_valid_moves(piece)
+            if list(expected.items()) != list(actual.items()):
+                raise AssertionError(f"{label}: moves differ for {piece}: {expected} != {actual}")
+            move_count += len(actual)
+
+        old = _time(reference.get_valid_moves, pieces)
+        new = _time(board.get_valid_moves, pieces)
+        total_old += old
+        total_new += new
+        print(f"{label:<20}{len(pieces):>8}{move_count:>8}{old * 1000:>15.1f}{new * 1000:>12.1f}{old / new:>9.2f}x")
+
+    print(f"{'total':<36}{total_old * 1000:>15.1f}{total_new * 1000:>12.1f}{total_old / total_new:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# parallel_search.py - Check that the parallel root search picks the same moves as the sequential one
+#
+# Run from the project root:
+#   python -m benchmarks.parallel_search
+#
+# Exits with status 1 if any parallel search disagrees with the sequential search.
+
+import sys
+import time
+from copy import deepcopy
+
+from ai_player import AI, BACKENDS
+from benchmarks.movegen import fixed_positions
+from components.game import Game
+from utils.constants import RED, WHITE
+
+DEPTH = 4
+WORKER_COUNTS = (2, 3)
+
+
+def _move(ai, board, color):
+    # The move as squares, so moves found on different board copies compare equal
+    game = Game()
+    game.board = deepcopy(board)
+    game.red_turn = color == RED
+    result = ai.get_move(game)
+    if result is None:
+        return None
+    piece, move = result
+    return (piece.row, piece.col), move
+
+
+def main():
+    positions = fixed_positions()[::5]
+    failures = 0
+
+    print(f"{'backend':<10}{'workers':>8}{'searches':>10}{'differ':>8}{'seq s':>8}{'par s':>8}")
+    for backend in BACKENDS:
+        for workers in WORKER_COUNTS:
+            searches = differ = 0
+            sequential_time = parallel_time = 0.0
+            for color in (RED, WHITE):
+                # No transposition tables, so every search starts from scratch
+                parallel = AI(color, backend=backend, depth=DEPTH, workers=workers, tt_size_mb=0)
+                try:
+                    for label, board in positions:
+                        sequential = AI(color, backend=backend, depth=DEPTH, tt_size_mb=0)
+
+                        start = time.perf_counter()
+                        expected = _move(sequential, board, color)
+                        sequential_time += time.perf_counter() - start
+
+                        start = time.perf_counter()
+                        found = _move(parallel, board, color)
+                        parallel_time += time.perf_counter() - start
+
+                        searches += 1
+                        if found != expected:
+                            differ += 1
+                            print(f"  {label} ({'red' if color == RED else 'white'}): "
+                                  f"sequential {expected}, parallel {found}", file=sys.stderr)
+                finally:
+                    parallel.close()
+
+            failures += differ
+            print(f"{backend:<10}{workers:>8}{searches:>10}{differ:>8}{sequential_time:>8.2f}{parallel_time:>8.2f}")
+
+    if failures:
+        print(f"{failures} parallel search(es) picked a different move", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+# perft.py - Move path enumeration to validate and time the move generators
+#
+# Run from the project root:
+#   python -m benchmarks.perft --depth 6                      # start position, every backend
+#   python -m benchmarks.perft --position multi-jump --depth 5 --divide
+#   python -m benchmarks.perft --position "....w.w..ww....wwww.r...wRw.R.r." --side red --depth 4
+#   python -m benchmarks.perft --position "W:W1,5,K18:R22,K30" --depth 6
+#   python -m benchmarks.perft --depth 8 --mandatory-capture
+#
+# Every backend must produce the same counts; the run exits with status 1 otherwise.
+
+import argparse
+import sys
+import time
+
+from copy import deepcopy
+
+from benchmarks.movegen import RecursiveMoveGenerator
+from components.bitboard import BitBoard, square_to_rowcol
+from components.board import Board
+from utils.constants import RED, WHITE
+
+# "reference" is Board driven by the original recursive move generator
+BACKENDS = ("board", "bitboard", "reference")
+
+
+class ReferenceBoard:
+    """A Board whose moves come from the original recursive generator, as the ground truth"""
+
+    def __init__(self, board):
+        self.board = board
+        self.generator = RecursiveMoveGenerator(board)
+
+    def get_all_moves(self, color, mandatory_capture=False):
+        moves = [(piece, move, skipped)
+                 for piece in self.board.pieces(color)
+                 for move, skipped in self.generator.get_valid_moves(piece).items()]
+        # Mandatory captures by filtering the full list, as a check on the fast capture detection
+        if mandatory_capture and any(skipped for piece, move, skipped in moves):
+            return [entry for entry in moves if entry[2]]
+        return moves
+
+    def make_move(self, piece, dest, skipped):
+        return self.board.make_move(piece, dest, skipped)
+
+    def unmake_move(self, undo):
+        self.board.unmake_move(undo)
+
+
+def search_board(board, backend):
+    """The position in a backend's representation"""
+    if backend == "bitboard":
+        return BitBoard.from_board(board)
+    if backend == "reference":
+        return ReferenceBoard(deepcopy(board))
+    return board
+
+
+def perft(board, color, depth, mandatory_capture=False):
+    """
+    Count the move paths of the given length from a position, on a Board or BitBoard.
+    Returns:
+        tuple: (leaves, captures) where captures counts the paths whose last move captures
+    """
+    if depth == 0:
+        return 1, 0
+
+    moves = board.get_all_moves(color, mandatory_capture)
+    if depth == 1:
+        # Bulk count: the last moves don't need to be made
+        return len(moves), sum(1 for piece, move, skipped in moves if skipped)
+
+    other = WHITE if color == RED else RED
+    leaves = captures = 0
+    for piece, move, skipped in moves:
+        undo = board.make_move(piece, move, skipped)
+        child_leaves, child_captures = perft(board, other, depth - 1, mandatory_capture)
+        board.unmake_move(undo)
+        leaves += child_leaves
+        captures += child_captures
+    return leaves, captures
+
+
+def divide(board, color, depth, mandatory_capture=False):
+    """
+    perft broken down by root move.
+    Returns:
+        list: ((from (row, col), to (row, col)), leaves, captures) in move generation order
+    """
+    other = WHITE if color == RED else RED
+    results = []
+    for piece, move, skipped in board.get_all_moves(color, mandatory_capture):
+        if isinstance(board, BitBoard):
+            root_move = (square_to_rowcol(piece), square_to_rowcol(move))
+        else:
+            root_move = ((piece.row, piece.col), move)
+
+        undo = board.make_move(piece, move, skipped)
+        leaves, captures = (perft(board, other, depth - 1, mandatory_capture) if depth > 1
+                            else (1, 1 if skipped else 0))
+        board.unmake_move(undo)
+        results.append((root_move, leaves, captures))
+    return results
+
+
+def _load_position(position, side):
+    # A position name from benchmarks/positions.txt, a FEN string or a 32-character square string
+    from benchmarks.suite import board_from_squares, load_positions
+
+    if position is None:
+        return Board(), RED if side is None else side
+    if ":" in position:
+        board, color = Board.from_fen(position)
+        return board, color if side is None else side
+    for name, color, board, depth, leaves in load_positions():
+        if name == position:
+            return board, color if side is None else side
+    return board_from_squares(position), RED if side is None else side
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count move paths with every move generator and time them")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--position", help="Name from benchmarks/positions.txt, FEN or square string (default: start)")
+    parser.add_argument("--side", choices=("red", "white"), help="Side to move")
+    parser.add_argument("--backend", choices=BACKENDS, action="append", help="Backends to run (default: all)")
+    parser.add_argument("--divide", action="store_true", help="Break the counts down by root move")
+    parser.add_argument("--mandatory-capture", action="store_true", help="Generate moves with captures compulsory")
+    args = parser.parse_args()
+
+    side = {"red": RED, "white": WHITE, None: None}[args.side]
+    board, color = _load_position(args.position, side)
+
+    results = {}
+    for backend in args.backend or BACKENDS:
+        position = search_board(board, backend)
+        start = time.perf_counter()
+        if args.divide:
+            counts = divide(position, color, args.depth, args.mandatory_capture)
+            leaves = sum(entry[1] for entry in counts)
+            captures = sum(entry[2] for entry in counts)
+        else:
+            counts = None
+            leaves, captures = perft(position, color, args.depth, args.mandatory_capture)
+        elapsed = time.perf_counter() - start
+
+        results[backend] = (leaves, captures, counts)
+        print(f"{backend:<10} perft({args.depth}) = {leaves:,} leaves, {captures:,} captures "
+              f"in {elapsed:.2f}s ({leaves / elapsed:,.0f} leaves/s)")
+
+    if args.divide:
+        reference = next(iter(results.values()))[2]
+        for (start, end), leaves, captures in reference:
+            print(f"  {start} -> {end}: {leaves:,} leaves, {captures:,} captures")
+
+    outcomes = list(results.values())
+    if any(outcome != outcomes[0] for outcome in outcomes[1:]):
+        print("Backends disagree", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# root_search.py - Nodes searched by the alpha-beta root search against the original full-window one
+#
+# Run from the project root:
+#   python -m benchmarks.root_search
+
+import time
+
+from ai_player import AI
+from benchmarks.movegen import fixed_positions
+from components.game import Game
+from engine.transposition import EXACT
+from utils.constants import RED, WHITE
+
+DEPTHS = (3, 4, 5)
+
+
+def full_window_root(ai, board, moves, depth):
+    """The original root loop: every root move searched with a full (-inf, inf) window"""
+    best_value = float('-inf') if ai.color == RED else float('inf')
+    best_key = None
+    for piece, move, skipped in moves:
+        value = ai.search_root_move(board, piece, move, skipped, depth, float('-inf'), float('inf'))
+        if (ai.color == RED and value > best_value) or (ai.color == WHITE and value < best_value):
+            best_value = value
+            best_key = ai._move_key(piece, move)
+    if ai.tt is not None:
+        ai.tt.store(ai._tt_key(board, ai.color == RED), depth, EXACT, best_value, best_key)
+    return best_value, best_key
+
+
+def _search(root, board, color, depth):
+    # Fresh AI per search so no transposition table or history carries over
+    ai = AI(color)
+    game = Game()
+    game.board = board
+    search_board = ai._search_board(game)
+    moves = ai._ordered_moves(search_board, color)
+    if not moves:
+        return None
+
+    ai.nodes = 0
+    start = time.perf_counter()
+    value, key = root(ai, search_board, moves, depth)
+    elapsed = time.perf_counter() - start
+    return value, key, ai.nodes, elapsed
+
+
+def main():
+    positions = fixed_positions()
+
+    print(f"{'depth':>5}{'searches':>10}{'full window':>14}{'alpha-beta':>12}{'reduction':>11}{'full s':>9}{'a-b s':>8}")
+    for depth in DEPTHS:
+        searches = old_nodes = new_nodes = 0
+        old_time = new_time = 0.0
+        for label, board in positions:
+            for color in (RED, WHITE):
+                old = _search(full_window_root, board, color, depth)
+                new = _search(AI._search_root, board, color, depth)
+                if old is None:
+                    continue
+
+                # Both searches must agree on the score and the move
+                if old[:2] != new[:2]:
+                    raise AssertionError(f"{label} depth {depth}: {old[:2]} != {new[:2]}")
+                searches += 1
+                old_nodes += old[2]
+                new_nodes += new[2]
+                old_time += old[3]
+                new_time += new[3]
+
+        reduction = 1 - new_nodes / old_nodes
+        print(f"{depth:>5}{searches:>10}{old_nodes:>14}{new_nodes:>12}{reduction:>10.1%}{old_time:>9.2f}{new_time:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
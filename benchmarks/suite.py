@@ -0,0 +1,287 @@
+# suite.py - Benchmark suite: move generation, search and evaluation throughput on fixed positions
+#
+# Run from the project root:
+#   python -m benchmarks.suite                   # compare against benchmarks/baselines.json
+#   python -m benchmarks.suite --save-baselines  # record the current numbers as the baselines
+#   python -m benchmarks.suite --only perft --threshold 0.1
+#
+# Exits with status 1 if a perft count is wrong, or if any benchmark runs slower
+# or allocates more than its baseline by more than the threshold.
+#
+# Speeds are compared relative to a fixed reference workload timed in the same run,
+# so a machine that is busier or slower than when the baselines were saved does
+# not show up as regressions.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from ai_player import AI
+from benchmarks.perft import perft, search_board
+from components.board import Board
+from utils.constants import RED, WHITE
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+POSITIONS_FILE = os.path.join(BENCHMARK_DIR, "positions.txt")
+BASELINES_FILE = os.path.join(BENCHMARK_DIR, "baselines.json")
+
+# Allowed slowdown (and allocation growth) relative to the baseline before the run fails
+DEFAULT_THRESHOLD = 0.3
+# Peak allocation changes below this many KiB are noise, not regressions
+ALLOCATION_SLACK_KIB = 64
+
+# Each benchmark is timed in ROUNDS rounds of at least ROUND_TIME seconds, each followed
+# by a round of the reference workload; the median of the rounds' rates divided by the
+# reference's rate is what gets compared, which filters out most of the noise from
+# other processes and from the machine's speed changing during the run
+ROUNDS = 7
+ROUND_TIME = 0.1
+REFERENCE_QUEENS = 7
+SEARCH_DEPTH = 4
+EVAL_REPEATS = 2000
+
+BACKENDS = ("board", "bitboard")
+GROUPS = ("perft", "search", "eval")
+
+# Square notation: one character per playable square, square 0 (top left) to 31
+PIECE_CHARS = {"r": (RED, False), "R": (RED, True), "w": (WHITE, False), "W": (WHITE, True)}
+
+
+def board_from_squares(squares):
+    """Build a Board from the 32-character square notation used in positions.txt"""
+    if len(squares) != 32 or any(ch not in PIECE_CHARS and ch != "." for ch in squares):
+        raise ValueError(f"Bad position: {squares!r}")
+
+    red = white = kings = 0
+    for square, ch in enumerate(squares):
+        if ch == ".":
+            continue
+        color, king = PIECE_CHARS[ch]
+        if color == RED:
+            red |= 1 << square
+        else:
+            white |= 1 << square
+        if king:
+            kings |= 1 << square
+    return Board.from_masks(red, white, kings)
+
+
+def load_positions(path=POSITIONS_FILE):
+    """
+    Read the benchmark positions.
+    Returns:
+        list: (name, color to move, Board, perft depth, expected perft leaf count) tuples
+    """
+    positions = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            name, side, squares, depth, leaves = line.split()
+            color = {"red": RED, "white": WHITE}[side]
+            positions.append((name, color, board_from_squares(squares), int(depth), int(leaves)))
+    return positions
+
+
+def reference_run(size=REFERENCE_QUEENS):
+    """
+    The reference workload: count the ways to place size non-attacking queens by
+    backtracking. It doesn't use any of the engine's code, so its speed only
+    depends on the machine and the Python version.
+    Returns:
+        int: Number of placements tried, the work units
+    """
+    def place(row, columns, diagonals, anti_diagonals):
+        tried = 0
+        for col in range(size):
+            if col in columns or row - col in diagonals or row + col in anti_diagonals:
+                continue
+            tried += 1
+            if row + 1 < size:
+                tried += place(row + 1, columns | {col}, diagonals | {row - col}, anti_diagonals | {row + col})
+        return tried
+    return place(0, frozenset(), frozenset(), frozenset())
+
+
+def _round_rate(run):
+    # Work units per second over one round; run() returns the work units it did
+    work = 0
+    start = time.perf_counter()
+    while True:
+        work += run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= ROUND_TIME:
+            return work / elapsed
+
+
+def _median_rates(run):
+    """
+    Time run() in ROUNDS rounds, each followed by a round of the reference workload.
+    Returns:
+        tuple: (median rate, median of each round's rate divided by the reference's rate)
+    """
+    rates = []
+    relative = []
+    for _ in range(ROUNDS):
+        rate = _round_rate(run)
+        rates.append(rate)
+        relative.append(rate / _round_rate(reference_run))
+    return statistics.median(rates), statistics.median(relative)
+
+
+def _peak_kib(run):
+    # Peak memory allocated by one call, measured separately so tracing doesn't skew the timings
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def perft_benchmarks(positions):
+    for backend in BACKENDS:
+        for name, color, board, depth, expected in positions:
+            position = search_board(board, backend)
+            leaves, captures = perft(position, color, depth)
+            if leaves != expected:
+                raise AssertionError(f"perft({depth}) of {name} on {backend}: {leaves} != {expected}")
+
+            def run(position=position, color=color, depth=depth):
+                perft(position, color, depth)
+                return leaves
+            yield f"perft/{backend}/{name}", "nodes", run
+
+
+def search_benchmarks(positions):
+    for backend in BACKENDS:
+        for name, color, board, depth, expected in positions:
+            def run(board=board, color=color, backend=backend):
+                # A fresh AI each time, so nothing is reused from an earlier run
+                ai = AI(color, backend=backend, depth=SEARCH_DEPTH)
+                position = search_board(board, backend)
+                moves = ai._ordered_moves(position, color)
+                ai._search_root(position, moves, SEARCH_DEPTH)
+                return ai.nodes
+            yield f"search/{backend}/{name}", "nodes", run
+
+
+def eval_benchmarks(positions):
+    # Board's running evaluation, a full Board scan (any non-default weights) and BitBoard's tables
+    evaluators = (
+        ("board", AI(RED), "board"),
+        ("board-scan", AI(RED, eval_weights={"king": 16}), "board"),
+        ("bitboard", AI(RED, backend="bitboard"), "bitboard"),
+    )
+    for kind, ai, backend in evaluators:
+        for name, color, board, depth, expected in positions:
+            position = search_board(board, backend)
+
+            def run(ai=ai, position=position):
+                evaluate = ai.evaluate_board
+                for _ in range(EVAL_REPEATS):
+                    evaluate(position)
+                return EVAL_REPEATS
+            yield f"eval/{kind}/{name}", "evals", run
+
+
+def run_suite(groups=GROUPS, positions=None):
+    """
+    Run the benchmarks.
+    Returns:
+        dict: name -> {"unit", "work", "rate", "relative", "peak_kib"}, where
+            relative is the rate as a multiple of the reference workload's rate
+    """
+    positions = positions if positions is not None else load_positions()
+    factories = {"perft": perft_benchmarks, "search": search_benchmarks, "eval": eval_benchmarks}
+    results = {}
+    for group in groups:
+        for name, unit, run in factories[group](positions):
+            work = run()
+            rate, relative = _median_rates(run)
+            results[name] = {
+                "unit": unit,
+                "work": work,
+                "rate": round(rate),
+                "relative": round(relative, 4),
+                "peak_kib": round(_peak_kib(run), 1),
+            }
+    return results
+
+
+def compare(results, baselines, threshold):
+    """
+    Compare results with the baselines. Speeds are compared relative to the
+    reference workload; baselines saved without that count as missing.
+    Returns:
+        list: (name, speed change, allocation change, failure reason or None) for every result
+    """
+    rows = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None or "relative" not in baseline:
+            rows.append((name, None, None, None))
+            continue
+
+        rate_change = result["relative"] / baseline["relative"] - 1
+        peak_change = result["peak_kib"] - baseline["peak_kib"]
+        failure = None
+        if rate_change < -threshold:
+            failure = f"{-rate_change:.0%} slower"
+        elif peak_change > ALLOCATION_SLACK_KIB and result["peak_kib"] > baseline["peak_kib"] * (1 + threshold):
+            failure = f"{peak_change:.0f} KiB more allocated"
+        rows.append((name, rate_change, peak_change, failure))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and check it against the baselines")
+    parser.add_argument("--only", choices=GROUPS, action="append", help="Benchmark groups to run (default: all)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed regression as a fraction (default %(default)s)")
+    parser.add_argument("--baselines", default=BASELINES_FILE)
+    parser.add_argument("--save-baselines", action="store_true", help="Write these results as the new baselines")
+    args = parser.parse_args()
+
+    results = run_suite(args.only or GROUPS)
+
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            baselines = json.load(f)["results"]
+
+    # "relative" and "baseline" are multiples of the reference workload's rate
+    print(f"{'benchmark':<36}{'work':>10}{'rate/s':>12}{'relative':>10}{'baseline':>10}{'change':>9}"
+          f"{'peak KiB':>10}  status")
+    failures = 0
+    for name, rate_change, peak_change, failure in compare(results, baselines, args.threshold):
+        result = results[name]
+        baseline = f"{baselines[name]['relative']:>10.3f}" if rate_change is not None else f"{'-':>10}"
+        change = f"{rate_change:>+9.1%}" if rate_change is not None else f"{'-':>9}"
+        status = failure or ("new" if rate_change is None else "ok")
+        failures += failure is not None
+        print(f"{name:<36}{result['work']:>10,}{result['rate']:>12,.0f}{result['relative']:>10.3f}{baseline}"
+              f"{change}{result['peak_kib']:>10.1f}  {status}")
+
+    if args.save_baselines:
+        with open(args.baselines, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "results": dict(baselines, **results)}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baselines to {args.baselines}", file=sys.stderr)
+        return 0
+
+    if failures:
+        print(f"{failures} benchmark(s) regressed by more than {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
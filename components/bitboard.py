@@ -0,0 +1,498 @@
+# bitboard.py - Compact bitboard position used as an alternative search backend
+
+from functools import lru_cache
+from operator import itemgetter
+from utils.constants import ROWS, COLS, RED, WHITE, DEFAULT_EVAL_WEIGHTS
+from utils.zobrist import PIECE_KEYS
+
+# The 32 dark squares are numbered 0-31, four per row, top row first.
+# Square index = row * 4 + col // 2
+SQUARES = (ROWS * COLS) // 2
+FULL_MASK = (1 << SQUARES) - 1
+
+# Diagonal directions as (row step, col step), in the same order that
+# Board.get_valid_moves explores them: up-left, up-right, down-left, down-right
+UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT = range(4)
+DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+def rowcol_to_square(row, col):
+    """Return the square index (0-31) for a dark square, or -1 for anything else"""
+    if 0 <= row < ROWS and 0 <= col < COLS and col % 2 == ((row + 1) % 2):
+        return row * 4 + col // 2
+    return -1
+
+
+def square_to_rowcol(square):
+    """Return the (row, col) of a square index"""
+    row = square // 4
+    return row, (square % 4) * 2 + (1 if row % 2 == 0 else 0)
+
+
+def _build_neighbors():
+    # NEIGHBORS[direction][square] -> adjacent square in that direction, or -1
+    table = []
+    for d_row, d_col in DIRECTIONS:
+        row_table = []
+        for square in range(SQUARES):
+            row, col = square_to_rowcol(square)
+            row_table.append(rowcol_to_square(row + d_row, col + d_col))
+        table.append(tuple(row_table))
+    return tuple(table)
+
+
+NEIGHBORS = _build_neighbors()
+SQUARE_MASKS = tuple(1 << square for square in range(SQUARES))
+
+
+def _build_jump_groups():
+    # JUMP_GROUPS[direction] -> ((origin mask, jumped square offset, landing square offset), ...)
+    # The squares a jump in each direction can start from, grouped so that every square in a
+    # group has the same offsets; capture detection then tests a whole group with two shifts
+    table = []
+    for direction in range(len(DIRECTIONS)):
+        groups = {}
+        for square in range(SQUARES):
+            jumped = NEIGHBORS[direction][square]
+            landing = NEIGHBORS[direction][jumped] if jumped >= 0 else -1
+            if landing >= 0:
+                offsets = (jumped - square, landing - square)
+                groups[offsets] = groups.get(offsets, 0) | (1 << square)
+        table.append(tuple((mask, jumped, landing) for (jumped, landing), mask in groups.items()))
+    return tuple(table)
+
+
+JUMP_GROUPS = _build_jump_groups()
+
+
+def _build_step_groups():
+    # STEP_GROUPS[direction] -> ((origin mask, destination offset), ...)
+    # The same grouping as JUMP_GROUPS, for simple moves
+    table = []
+    for direction in range(len(DIRECTIONS)):
+        groups = {}
+        for square in range(SQUARES):
+            destination = NEIGHBORS[direction][square]
+            if destination >= 0:
+                offset = destination - square
+                groups[offset] = groups.get(offset, 0) | (1 << square)
+        table.append(tuple((mask, offset) for offset, mask in groups.items()))
+    return tuple(table)
+
+
+STEP_GROUPS = _build_step_groups()
+
+# Rows where each color gets crowned
+RED_CROWN_MASK = sum(SQUARE_MASKS[square] for square in range(4))
+WHITE_CROWN_MASK = sum(SQUARE_MASKS[square] for square in range(SQUARES - 4, SQUARES))
+
+
+@lru_cache(maxsize=None)
+def _build_piece_square_tables(man, king, advance, center):
+    red_men, white_men, kings = [], [], []
+    for square in range(SQUARES):
+        row, col = square_to_rowcol(square)
+        center_bonus = center if 2 <= row <= 5 and 2 <= col <= 5 else 0
+        red_men.append(man + advance * (3 - row if row < 3 else 0) + center_bonus)
+        white_men.append(man + advance * (row - 4 if row > 4 else 0) + center_bonus)
+        kings.append(king + center_bonus)
+    return tuple(red_men), tuple(white_men), tuple(kings)
+
+
+def evaluation_tables(weights):
+    """
+    Per-square piece values for the heuristic in AI.evaluate_board.
+    Returns:
+        tuple: (red man values, white man values, king values), each indexed by square
+    """
+    return _build_piece_square_tables(weights["man"], weights["king"], weights["advance"], weights["center"])
+
+
+DEFAULT_EVALUATION_TABLES = evaluation_tables(DEFAULT_EVAL_WEIGHTS)
+RED_MAN_VALUES, WHITE_MAN_VALUES, KING_VALUES = DEFAULT_EVALUATION_TABLES
+
+RED_MAN_KEYS, RED_KING_KEYS, WHITE_MAN_KEYS, WHITE_KING_KEYS = PIECE_KEYS
+
+
+def iter_squares(mask):
+    """Yield the square index of every set bit in mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitBoard:
+    """
+    Board position stored as three 32-bit masks over the dark squares.
+
+    Pieces are identified by their square index instead of Piece objects, so
+    the move generation and apply/undo operations mirror Board but take and
+    return square indices. Captured pieces are given as a bit mask.
+    """
+
+    def __init__(self, red=0, white=0, kings=0):
+        self.red = red
+        self.white = white
+        self.kings = kings
+        self.zobrist_key = self.compute_zobrist_key()
+        self.evaluation = self.compute_evaluation()  # Running score of evaluate() with the default tables
+
+    @classmethod
+    def from_board(cls, board):
+        """Build a BitBoard from a Board"""
+        red = white = kings = 0
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = board.get_piece(row, col)
+                if piece:
+                    bit = SQUARE_MASKS[rowcol_to_square(row, col)]
+                    if piece.color == RED:
+                        red |= bit
+                    else:
+                        white |= bit
+                    if piece.king:
+                        kings |= bit
+        return cls(red, white, kings)
+
+    @classmethod
+    def initial(cls):
+        """Return the standard starting position"""
+        white = sum(SQUARE_MASKS[square] for square in range(12))
+        red = sum(SQUARE_MASKS[square] for square in range(SQUARES - 12, SQUARES))
+        return cls(red, white, 0)
+
+    def copy(self):
+        return BitBoard(self.red, self.white, self.kings)
+
+    def compute_zobrist_key(self):
+        """Full Zobrist hash, using the same keys as Board"""
+        key = 0
+        kings = self.kings
+        for square in iter_squares(self.red & ~kings):
+            key ^= RED_MAN_KEYS[square]
+        for square in iter_squares(self.red & kings):
+            key ^= RED_KING_KEYS[square]
+        for square in iter_squares(self.white & ~kings):
+            key ^= WHITE_MAN_KEYS[square]
+        for square in iter_squares(self.white & kings):
+            key ^= WHITE_KING_KEYS[square]
+        return key
+
+    def _square_key(self, square):
+        bit = SQUARE_MASKS[square]
+        if self.red & bit:
+            return (RED_KING_KEYS if self.kings & bit else RED_MAN_KEYS)[square]
+        return (WHITE_KING_KEYS if self.kings & bit else WHITE_MAN_KEYS)[square]
+
+    def _square_score(self, square):
+        # Contribution of the piece on square to the evaluation (positive for RED, negative for WHITE)
+        bit = SQUARE_MASKS[square]
+        if self.red & bit:
+            return (KING_VALUES if self.kings & bit else RED_MAN_VALUES)[square]
+        return -(KING_VALUES if self.kings & bit else WHITE_MAN_VALUES)[square]
+
+    @property
+    def red_pieces(self):
+        return self.red.bit_count()
+
+    @property
+    def white_pieces(self):
+        return self.white.bit_count()
+
+    @property
+    def red_kings(self):
+        return (self.red & self.kings).bit_count()
+
+    @property
+    def white_kings(self):
+        return (self.white & self.kings).bit_count()
+
+    def get_color(self, square):
+        bit = SQUARE_MASKS[square]
+        if self.red & bit:
+            return RED
+        if self.white & bit:
+            return WHITE
+        return None
+
+    def is_king(self, square):
+        return bool(self.kings & SQUARE_MASKS[square])
+
+    def pieces(self, color):
+        """Yield the squares occupied by the given color"""
+        return iter_squares(self.red if color == RED else self.white)
+
+    def winner(self):
+        if not self.red:
+            return WHITE
+        elif not self.white:
+            return RED
+
+        return None
+
+    def _first_moves(self, color, steps=True):
+        """
+        Find the pieces of one side that can make a simple move or a first jump
+        in each direction, a few mask operations per direction.
+        Parameters:
+            steps: Also find simple moves (otherwise their masks are all 0)
+        Returns:
+            tuple: (simple move masks, jump masks), each a list indexed by direction
+        """
+        if color == RED:
+            own, opponent, forward = self.red, self.white, (UP_LEFT, UP_RIGHT)
+        else:
+            own, opponent, forward = self.white, self.red, (DOWN_LEFT, DOWN_RIGHT)
+        empty = ~(self.red | self.white) & FULL_MASK
+        kings = own & self.kings
+
+        step_masks = [0, 0, 0, 0]
+        jump_masks = [0, 0, 0, 0]
+        for direction in (UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT):
+            movers = own if direction in forward else kings
+            if not movers:
+                continue
+            # Shift the bit of square s + offset to square s: offsets are
+            # negative going up the board and positive going down
+            stepping = jumping = 0
+            if direction < DOWN_LEFT:
+                if steps:
+                    for mask, destination in STEP_GROUPS[direction]:
+                        stepping |= mask & (empty << -destination)
+                for mask, jumped, landing in JUMP_GROUPS[direction]:
+                    jumping |= mask & (opponent << -jumped) & (empty << -landing)
+            else:
+                if steps:
+                    for mask, destination in STEP_GROUPS[direction]:
+                        stepping |= mask & (empty >> destination)
+                for mask, jumped, landing in JUMP_GROUPS[direction]:
+                    jumping |= mask & (opponent >> jumped) & (empty >> landing)
+            step_masks[direction] = movers & stepping
+            jump_masks[direction] = movers & jumping
+        return step_masks, jump_masks
+
+    def capturing_squares(self, color):
+        """
+        Find every piece of one side that can capture, a few mask operations per direction.
+        Returns:
+            int: Mask of the squares of those pieces
+        """
+        up_left, up_right, down_left, down_right = self._first_moves(color, steps=False)[1]
+        return up_left | up_right | down_left | down_right
+
+    def has_capture(self, color):
+        """True if any piece of one side can capture"""
+        return self.capturing_squares(color) != 0
+
+    def get_valid_moves(self, square, mandatory_capture=False):
+        """
+        Get the moves of the piece on square.
+
+        Follows exactly the same rules (including how multi-jump chains are
+        recorded) as Board.get_valid_moves.
+        Parameters:
+            square: Square of the piece
+            mandatory_capture: Leave out quiet moves if any piece of the same side can capture
+        Returns:
+            dict: destination square -> mask of captured squares
+        """
+        moves = self._piece_moves(square)
+        if mandatory_capture and moves and self.has_capture(self.get_color(square)):
+            return {dest: captured for dest, captured in moves.items() if captured}
+        return moves
+
+    def _piece_moves(self, square):
+        # get_valid_moves without the capture rule
+        bit = SQUARE_MASKS[square]
+        if self.red & bit:
+            own, opponent = self.red, self.white
+            directions = (UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT) if self.kings & bit else (UP_LEFT, UP_RIGHT)
+        elif self.white & bit:
+            own, opponent = self.white, self.red
+            directions = (UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT) if self.kings & bit else (DOWN_LEFT, DOWN_RIGHT)
+        else:
+            return {}
+
+        occupied = own | opponent
+        moves = {}
+
+        # Each direction is followed to the end of its jump chains before the
+        # next, so entries are written in the same order as in Board
+        for direction in directions:
+            neighbors = NEIGHBORS[direction]
+            first = neighbors[square]
+            if first < 0:
+                continue
+
+            first_bit = SQUARE_MASKS[first]
+            if not occupied & first_bit:
+                moves[first] = 0
+            elif opponent & first_bit:
+                landing = neighbors[first]
+                if landing >= 0 and not occupied & SQUARE_MASKS[landing]:
+                    moves[landing] = first_bit
+                    self._continue_jumps(moves, landing, direction, first_bit, opponent, occupied)
+
+        return moves
+
+    @staticmethod
+    def _continue_jumps(moves, square, direction, captured, opponent, occupied):
+        """
+        Add the jumps that continue a capture in the given direction which
+        landed on square. Chains keep the same vertical direction, and each
+        entry's mask holds its last two captures, as in Board.
+        Parameters:
+            moves: dict of destination square -> captured mask to add to
+            captured: Mask of the capture that landed on square
+        """
+        # Explicit stack of (origin, direction, previously captured mask),
+        # pushed in reverse so entries are written in the same order as the
+        # recursive traversal in Board
+        if direction < DOWN_LEFT:
+            stack = [(square, UP_RIGHT, captured), (square, UP_LEFT, captured)]
+        else:
+            stack = [(square, DOWN_RIGHT, captured), (square, DOWN_LEFT, captured)]
+        while stack:
+            origin, direction, skipped = stack.pop()
+            neighbors = NEIGHBORS[direction]
+            jumped = neighbors[origin]
+            if jumped < 0:
+                continue
+            jumped_bit = SQUARE_MASKS[jumped]
+            if not opponent & jumped_bit:
+                continue
+
+            landing = neighbors[jumped]
+            if landing < 0 or occupied & SQUARE_MASKS[landing]:
+                continue
+
+            moves[landing] = jumped_bit | skipped
+            # Keep jumping in the same vertical direction
+            if direction < DOWN_LEFT:
+                stack.append((landing, UP_RIGHT, jumped_bit))
+                stack.append((landing, UP_LEFT, jumped_bit))
+            else:
+                stack.append((landing, DOWN_RIGHT, jumped_bit))
+                stack.append((landing, DOWN_LEFT, jumped_bit))
+
+    def get_all_moves(self, color, mandatory_capture=False):
+        """
+        Get every move for one side.
+        Parameters:
+            color: RED or WHITE
+            mandatory_capture: If any piece can capture, return only captures
+                (generated for just the pieces that can capture)
+        Returns:
+            list: (square, destination, captured mask) tuples
+        """
+        # Simple moves and first jumps come from whole-side masks; only
+        # continuing a multi-jump walks from square to square
+        step_masks, jump_masks = self._first_moves(color)
+        capturing = jump_masks[0] | jump_masks[1] | jump_masks[2] | jump_masks[3]
+        if mandatory_capture and capturing:
+            step_masks = [0, 0, 0, 0]
+
+        # Simple moves of the pieces that can't capture, a direction at a time
+        all_moves = []
+        for direction in (UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT):
+            stepping = step_masks[direction] & ~capturing
+            neighbors = NEIGHBORS[direction]
+            while stepping:
+                low = stepping & -stepping
+                square = low.bit_length() - 1
+                all_moves.append((square, neighbors[square], 0))
+                stepping ^= low
+
+        # The pieces that can capture, one at a time. Jump chains can land on the same
+        # square more than once, so their moves are collected in a dict as in get_valid_moves
+        opponent = self.white if color == RED else self.red
+        occupied = self.red | self.white
+        for square in iter_squares(capturing):
+            bit = SQUARE_MASKS[square]
+            moves = {}
+            for direction in (UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT):
+                if step_masks[direction] & bit:
+                    moves[NEIGHBORS[direction][square]] = 0
+                elif jump_masks[direction] & bit:
+                    neighbors = NEIGHBORS[direction]
+                    jumped = neighbors[square]
+                    landing = neighbors[jumped]
+                    moves[landing] = SQUARE_MASKS[jumped]
+                    self._continue_jumps(moves, landing, direction, SQUARE_MASKS[jumped], opponent, occupied)
+            for dest, captured in moves.items():
+                all_moves.append((square, dest, captured))
+
+        # Back into board-scan order; the sort is stable, so each piece keeps its direction order
+        all_moves.sort(key=itemgetter(0))
+        return all_moves
+
+    def move(self, square, dest):
+        """Move the piece on square to dest, crowning it if needed"""
+        bit, dest_bit = SQUARE_MASKS[square], SQUARE_MASKS[dest]
+        self.zobrist_key ^= self._square_key(square)
+        self.evaluation -= self._square_score(square)
+        if self.red & bit:
+            self.red ^= bit | dest_bit
+            if dest_bit & RED_CROWN_MASK:
+                self.kings |= bit
+        else:
+            self.white ^= bit | dest_bit
+            if dest_bit & WHITE_CROWN_MASK:
+                self.kings |= bit
+        if self.kings & bit:
+            self.kings ^= bit | dest_bit
+        self.zobrist_key ^= self._square_key(dest)
+        self.evaluation += self._square_score(dest)
+
+    def remove(self, captured):
+        """Remove every piece in the captured mask"""
+        for square in iter_squares(captured):
+            self.zobrist_key ^= self._square_key(square)
+            self.evaluation -= self._square_score(square)
+        keep = ~captured & FULL_MASK
+        self.red &= keep
+        self.white &= keep
+        self.kings &= keep
+
+    def make_move(self, square, dest, captured):
+        """
+        Apply a move and return a record that unmake_move can use to undo it.
+        """
+        undo = (self.red, self.white, self.kings, self.zobrist_key, self.evaluation)
+        self.move(square, dest)
+        if captured:
+            self.remove(captured)
+        return undo
+
+    def unmake_move(self, undo):
+        """Restore the position saved by make_move"""
+        self.red, self.white, self.kings, self.zobrist_key, self.evaluation = undo
+
+    def evaluate(self, tables=DEFAULT_EVALUATION_TABLES):
+        """
+        Score the position with the same heuristic as AI.evaluate_board.
+        With the default tables this is the running evaluation, kept up to date
+        by move and remove; other tables are scanned piece by piece.
+        Parameters:
+            tables: Piece values from evaluation_tables(), for non-default weights
+        """
+        # evaluation_tables() caches its tables, so the default weights always give this same object
+        if tables is DEFAULT_EVALUATION_TABLES:
+            return self.evaluation
+        return self.compute_evaluation(tables)
+
+    def compute_evaluation(self, tables=DEFAULT_EVALUATION_TABLES):
+        """Full rescan of evaluate()'s score; move and remove keep the default one up to date"""
+        red_man_values, white_man_values, king_values = tables
+        score = 0
+        kings = self.kings
+        for square in iter_squares(self.red & ~kings):
+            score += red_man_values[square]
+        for square in iter_squares(self.red & kings):
+            score += king_values[square]
+        for square in iter_squares(self.white & ~kings):
+            score -= white_man_values[square]
+        for square in iter_squares(self.white & kings):
+            score -= king_values[square]
+        return score
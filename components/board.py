@@ -1,7 +1,63 @@
 # board.py - Defines the Board class for board state
 
+import struct
+
 from utils.constants import ROWS, COLS, RED, WHITE
 from entities.piece import Piece
+from utils.zobrist import piece_key
+from components.bitboard import DEFAULT_EVALUATION_TABLES, NEIGHBORS, square_to_rowcol, \
+    RED_CROWN_MASK, WHITE_CROWN_MASK, UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT
+
+RED_MAN_VALUES, WHITE_MAN_VALUES, KING_VALUES = DEFAULT_EVALUATION_TABLES
+
+
+def piece_score(piece):
+    # Contribution of one piece to the evaluation (positive for RED, negative for WHITE)
+    square = piece.row * 4 + piece.col // 2
+    if piece.color == RED:
+        return KING_VALUES[square] if piece.king else RED_MAN_VALUES[square]
+    return -(KING_VALUES[square] if piece.king else WHITE_MAN_VALUES[square])
+
+
+UP_DIRECTIONS = (UP_LEFT, UP_RIGHT)
+DOWN_DIRECTIONS = (DOWN_LEFT, DOWN_RIGHT)
+ALL_DIRECTIONS = UP_DIRECTIONS + DOWN_DIRECTIONS
+
+
+def _build_diagonals():
+    # DIAGONALS[direction][square] -> (row, col, jump_row, jump_col, jump_square) of the
+    # adjacent square and the square beyond it (jump_square is -1 off the board),
+    # or None if there is no adjacent square
+    table = []
+    for direction in range(len(NEIGHBORS)):
+        entries = []
+        for square in range(len(NEIGHBORS[direction])):
+            adjacent = NEIGHBORS[direction][square]
+            if adjacent < 0:
+                entries.append(None)
+                continue
+            landing = NEIGHBORS[direction][adjacent]
+            jump_row, jump_col = square_to_rowcol(landing) if landing >= 0 else (-1, -1)
+            entries.append(square_to_rowcol(adjacent) + (jump_row, jump_col, landing))
+        table.append(tuple(entries))
+    return tuple(table)
+
+
+DIAGONALS = _build_diagonals()
+
+
+def scan_order(piece):
+    # Sort key giving the row-by-row order of a full board scan
+    return piece.row * COLS + piece.col
+
+
+# Binary encoding: red, white and king masks (bit n = square n) and the side to move (0 RED, 1 WHITE)
+POSITION_FORMAT = struct.Struct("<IIIB")
+POSITION_SIZE = POSITION_FORMAT.size
+
+
+def _unpickle_board(data):
+    return Board.from_bytes(data)[0]
 
 
 class Board:
@@ -9,6 +65,9 @@ class Board:
         self.board = []
         self.red_pieces = self.white_pieces = 12
         self.red_kings = self.white_kings = 0
+        self.zobrist_key = 0
+        self.evaluation = 0  # Running score of AI.evaluate_board with the default weights
+        self.piece_sets = {RED: set(), WHITE: set()}  # Pieces still on the board, per color
         self.create_board()
 
     def create_board(self):
@@ -23,6 +82,125 @@ class Board:
                     elif row > 4:
                         self.board[row][col] = Piece(row, col, RED)
 
+        self._index_pieces()
+
+    def _index_pieces(self):
+        # Rebuild the piece sets, counters, Zobrist key and evaluation from the board array
+        self.piece_sets = {RED: set(), WHITE: set()}
+        for row in self.board:
+            for piece in row:
+                if piece:
+                    self.piece_sets[piece.color].add(piece)
+
+        self.red_pieces = len(self.piece_sets[RED])
+        self.white_pieces = len(self.piece_sets[WHITE])
+        self.red_kings = sum(1 for piece in self.piece_sets[RED] if piece.king)
+        self.white_kings = sum(1 for piece in self.piece_sets[WHITE] if piece.king)
+        self.zobrist_key = self.compute_zobrist_key()
+        self.evaluation = self.compute_evaluation()
+
+    @classmethod
+    def from_masks(cls, red, white, kings):
+        # Board with pieces on the squares whose bits are set (bit n = square n, row by row from the top left)
+        if red & white or kings & ~(red | white) or (red | white) >> 32:
+            raise ValueError("Overlapping or out of range piece masks")
+        if (red & ~kings & RED_CROWN_MASK) or (white & ~kings & WHITE_CROWN_MASK):
+            raise ValueError("Uncrowned man on its crowning row")
+
+        board = cls.__new__(cls)
+        board.board = [[None for _ in range(COLS)] for _ in range(ROWS)]
+        for square in range(32):
+            bit = 1 << square
+            if (red | white) & bit:
+                row, col = square_to_rowcol(square)
+                piece = Piece(row, col, RED if red & bit else WHITE)
+                if kings & bit:
+                    piece.make_king()
+                board.board[row][col] = piece
+        board._index_pieces()
+        return board
+
+    def masks(self):
+        # The position as (red, white, kings) square masks
+        red = white = kings = 0
+        for color, pieces in self.piece_sets.items():
+            for piece in pieces:
+                bit = 1 << (piece.row * 4 + piece.col // 2)
+                if color == RED:
+                    red |= bit
+                else:
+                    white |= bit
+                if piece.king:
+                    kings |= bit
+        return red, white, kings
+
+    def to_fen(self, color=RED):
+        # PDN-style text: side to move, then each side's squares numbered 1-32 from the
+        # top left, kings prefixed with K, e.g. "R:W1,2,K3:R21,K30"
+        red, white, kings = self.masks()
+        sides = []
+        for letter, mask in (("W", white), ("R", red)):
+            squares = [("K" if kings >> square & 1 else "") + str(square + 1)
+                       for square in range(32) if mask >> square & 1]
+            sides.append(letter + ",".join(squares))
+        return ("R" if color == RED else "W") + ":" + ":".join(sides)
+
+    @classmethod
+    def from_fen(cls, fen):
+        # Parse to_fen's notation; returns (board, color to move)
+        parts = fen.strip().split(":")
+        if len(parts) != 3 or parts[0] not in ("R", "W") or sorted(part[:1] for part in parts[1:]) != ["R", "W"]:
+            raise ValueError(f"Bad position: {fen!r}")
+
+        masks = {"R": 0, "W": 0}
+        kings = 0
+        for part in parts[1:]:
+            for token in filter(None, part[1:].split(",")):
+                king = token.startswith("K")
+                number = token[1:] if king else token
+                if not number.isdigit() or not 1 <= int(number) <= 32:
+                    raise ValueError(f"Bad square {token!r} in {fen!r}")
+                square = int(number) - 1
+                if (masks["R"] | masks["W"]) >> square & 1:
+                    raise ValueError(f"Square {number} used twice in {fen!r}")
+                masks[part[0]] |= 1 << square
+                if king:
+                    kings |= 1 << square
+
+        return cls.from_masks(masks["R"], masks["W"], kings), RED if parts[0] == "R" else WHITE
+
+    def to_bytes(self, color=RED):
+        # Fixed-size binary encoding (POSITION_SIZE bytes) of the position and side to move
+        red, white, kings = self.masks()
+        return POSITION_FORMAT.pack(red, white, kings, 0 if color == RED else 1)
+
+    @classmethod
+    def from_bytes(cls, data):
+        # Decode to_bytes; returns (board, color to move)
+        if len(data) != POSITION_SIZE:
+            raise ValueError(f"Position encodings are {POSITION_SIZE} bytes, got {len(data)}")
+        red, white, kings, side = POSITION_FORMAT.unpack(data)
+        if side not in (0, 1):
+            raise ValueError(f"Bad side to move: {side}")
+        return cls.from_masks(red, white, kings), RED if side == 0 else WHITE
+
+    def __reduce__(self):
+        # Pickle (and deepcopy) as the compact encoding instead of the whole Piece object graph
+        return _unpickle_board, (self.to_bytes(),)
+
+    def compute_evaluation(self):
+        # Full rescan of the evaluation; move, remove and crowning keep it up to date incrementally
+        return sum(piece_score(piece) for row in self.board for piece in row if piece)
+
+    def compute_zobrist_key(self):
+        # Full Zobrist hash of the pieces; move and remove keep it up to date incrementally
+        key = 0
+        for row in self.board:
+            for piece in row:
+                if piece:
+                    key ^= piece_key(piece)
+        return key
+
     def get_piece(self, row, col):
         if 0 <= row < ROWS and 0 <= col < COLS:
             return self.board[row][col]
@@ -33,6 +211,8 @@ class Board:
         self.board[piece.row][piece.col], self.board[row][col] = None, self.board[piece.row][piece.col]
 
         # Update piece position
+        self.zobrist_key ^= piece_key(piece)
+        self.evaluation -= piece_score(piece)
         piece.move(row, col)
 
         # Check if piece should be crowned
@@ -43,14 +223,46 @@ class Board:
             piece.make_king()
             self.white_kings += 1
 
+        self.zobrist_key ^= piece_key(piece)
+        self.evaluation += piece_score(piece)
+
     def remove(self, pieces):
         for piece in pieces:
             self.board[piece.row][piece.col] = None
+            self.zobrist_key ^= piece_key(piece)
+            self.evaluation -= piece_score(piece)
+            self.piece_sets[piece.color].discard(piece)
             if piece.color == RED:
                 self.red_pieces -= 1
             else:
                 self.white_pieces -= 1
 
+    def make_move(self, piece, dest, skipped):
+        # Apply a move in place and return a record that unmake_move can undo
+        undo = (piece, piece.row, piece.col, piece.king, skipped, self.zobrist_key, self.evaluation,
+                self.red_pieces, self.white_pieces, self.red_kings, self.white_kings)
+
+        self.move(piece, dest[0], dest[1])
+        if skipped:
+            self.remove(skipped)
+
+        return undo
+
+    def unmake_move(self, undo):
+        (piece, row, col, king, skipped, self.zobrist_key, self.evaluation,
+         self.red_pieces, self.white_pieces, self.red_kings, self.white_kings) = undo
+
+        # Put the piece back on its starting square and restore its king flag
+        self.board[piece.row][piece.col] = None
+        self.board[row][col] = piece
+        piece.move(row, col)
+        piece.king = king
+
+        # Captured pieces still know their squares, so just place them back
+        for captured in skipped:
+            self.board[captured.row][captured.col] = captured
+            self.piece_sets[captured.color].add(captured)
+
     def winner(self):
         if self.red_pieces <= 0:
             return WHITE
@@ -59,95 +271,93 @@ class Board:
 
         return None
 
-    def get_valid_moves(self, piece):
-        moves = {}
-        left = piece.col - 1
-        right = piece.col + 1
-        row = piece.row
+    def pieces(self, color):
+        # Iterate over one side's pieces in board-scan order without visiting empty squares
+        return iter(sorted(self.piece_sets[color], key=scan_order))
 
-        # Different move directions based on color and king status
-        if piece.color == RED or piece.king:
-            # Moving upward (red pieces and kings)
-            moves.update(self._traverse_left(row - 1, max(row - 3, -1), -1, piece.color, left))
-            moves.update(self._traverse_right(row - 1, max(row - 3, -1), -1, piece.color, right))
+    def get_all_moves(self, color, mandatory_capture=False):
+        # Every move for one side as (piece, (row, col), skipped) tuples, in board-scan order.
+        # With mandatory_capture, only captures are returned whenever the side has one.
+        if mandatory_capture and self.has_capture(color):
+            return [(piece, move, skipped)
+                    for piece in self.pieces(color)
+                    for move, skipped in dict(self.iter_moves(piece)).items() if skipped]
 
-        if piece.color == WHITE or piece.king:
-            # Moving downward (white pieces and kings)
-            moves.update(self._traverse_left(row + 1, min(row + 3, ROWS), 1, piece.color, left))
-            moves.update(self._traverse_right(row + 1, min(row + 3, ROWS), 1, piece.color, right))
+        all_moves = []
+        for piece in self.pieces(color):
+            for move, skipped in self.get_valid_moves(piece).items():
+                all_moves.append((piece, move, skipped))
+        return all_moves
 
+    def get_valid_moves(self, piece, mandatory_capture=False):
+        # Moves of one piece as {(row, col): [captured pieces]}.
+        # With mandatory_capture, quiet moves are left out if any piece of its side can capture.
+        moves = dict(self.iter_moves(piece))
+        if mandatory_capture and moves and self.has_capture(piece.color):
+            return {move: skipped for move, skipped in moves.items() if skipped}
         return moves
 
-    def _traverse_left(self, start, stop, step, color, left, skipped=None):
-        if skipped is None:
-            skipped = []
-
-        moves = {}
-        last = []
-
-        for r in range(start, stop, step):
-            if left < 0:
-                break
-
-            current = self.get_piece(r, left)
-            if current is None:
-                if skipped and not last:
-                    break
-                elif skipped:
-                    moves[(r, left)] = last + skipped
-                else:
-                    moves[(r, left)] = last
-
-                if last:
-                    if step == -1:
-                        row = max(r - 3, -1)
-                    else:
-                        row = min(r + 3, ROWS)
-                    moves.update(self._traverse_left(r + step, row, step, color, left - 1, skipped=last))
-                    moves.update(self._traverse_right(r + step, row, step, color, left + 1, skipped=last))
-                break
-            elif current.color == color:
-                break
+    def has_capture(self, color):
+        # True if any piece of one side can jump, checked square by square with the
+        # precomputed diagonal tables and stopping at the first capture found
+        board = self.board
+        for piece in self.piece_sets[color]:
+            if piece.king:
+                directions = ALL_DIRECTIONS
             else:
-                last = [current]
+                directions = UP_DIRECTIONS if color == RED else DOWN_DIRECTIONS
 
-            left -= 1
+            square = piece.row * 4 + piece.col // 2
+            for direction in directions:
+                step = DIAGONALS[direction][square]
+                if step is None or step[4] < 0:
+                    continue
+                current = board[step[0]][step[1]]
+                if current is not None and current.color != color and board[step[2]][step[3]] is None:
+                    return True
+        return False
 
-        return moves
-
-    def _traverse_right(self, start, stop, step, color, right, skipped=None):
-        if skipped is None:
-            skipped = []
+    def iter_moves(self, piece):
+        # Lazily yield ((row, col), skipped) for one piece using the precomputed
+        # diagonal tables. Multi-jump chains are followed with an explicit stack
+        # in the same order as a depth-first traversal, so when two chains reach
+        # the same square the later one wins in get_valid_moves.
+        board = self.board
+        color = piece.color
 
-        moves = {}
-        last = []
+        # Different move directions based on color and king status
+        if piece.king:
+            directions = ALL_DIRECTIONS
+        elif color == RED:
+            directions = UP_DIRECTIONS  # Moving upward (red pieces)
+        else:
+            directions = DOWN_DIRECTIONS  # Moving downward (white pieces)
 
-        for r in range(start, stop, step):
-            if right >= COLS:
-                break
+        # Stack entries are (origin square, direction, piece captured to reach origin)
+        stack = [(piece.row * 4 + piece.col // 2, direction, None) for direction in reversed(directions)]
+        while stack:
+            origin, direction, captured = stack.pop()
+            step = DIAGONALS[direction][origin]
+            if step is None:
+                continue
 
-            current = self.get_piece(r, right)
+            row, col, jump_row, jump_col, landing = step
+            current = board[row][col]
             if current is None:
-                if skipped and not last:
-                    break
-                elif skipped:
-                    moves[(r, right)] = last + skipped
-                else:
-                    moves[(r, right)] = last
-
-                if last:
-                    if step == -1:
-                        row = max(r - 3, -1)
-                    else:
-                        row = min(r + 3, ROWS)
-                    moves.update(self._traverse_left(r + step, row, step, color, right - 1, skipped=last))
-                    moves.update(self._traverse_right(r + step, row, step, color, right + 1, skipped=last))
-                break
-            elif current.color == color:
-                break
-            else:
-                last = [current]
+                # Simple moves are only allowed as the first step
+                if captured is None:
+                    yield (row, col), []
+                continue
+            if current.color == color or landing < 0 or board[jump_row][jump_col] is not None:
+                continue
 
-            right += 1
+            # The chain records the piece just jumped and the one before it
+            yield (jump_row, jump_col), [current] if captured is None else [current, captured]
 
-        return moves
\ No newline at end of file
+            # Keep jumping in the same vertical direction
+            if direction in UP_DIRECTIONS:
+                stack.append((landing, UP_RIGHT, current))
+                stack.append((landing, UP_LEFT, current))
+            else:
+                stack.append((landing, DOWN_RIGHT, current))
+                stack.append((landing, DOWN_LEFT, current))
\ No newline at end of file
@@ -2,15 +2,31 @@
 
 from utils.constants import RED, WHITE
 from .board import Board
+from .record import GameRecord, result_name
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, log=None, mandatory_capture=False):
         self.board = Board()
         self.selected_piece = None
         self.red_turn = True
         self.valid_moves = {}
 
+        # Standard checkers rule: when a capture is available, only captures may be played
+        self.mandatory_capture = mandatory_capture
+
+        # Every move made is recorded, and appended to the GameLog if there is one
+        self.record = GameRecord()
+        self.log = log
+        if log:
+            log.start_game(self.record)
+
+    def __getstate__(self):
+        # The log's open file can't be sent to a search process
+        state = self.__dict__.copy()
+        state["log"] = None
+        return state
+
     def update(self):
         # Game state updates that happen each frame
         pass
@@ -28,7 +44,7 @@ class Game:
         piece = self.board.get_piece(row, col)
         if piece and piece.color == (RED if self.red_turn else WHITE):
             self.selected_piece = piece
-            self.valid_moves = self.board.get_valid_moves(piece)
+            self.valid_moves = self.board.get_valid_moves(piece, self.mandatory_capture)
             return True
 
         return False
@@ -36,10 +52,15 @@ class Game:
     def _move(self, row, col):
         piece = self.board.get_piece(row, col)
         if self.selected_piece and (row, col) in self.valid_moves and not piece:
+            start = (self.selected_piece.row, self.selected_piece.col)
             self.board.move(self.selected_piece, row, col)
             skipped = self.valid_moves[(row, col)]
             if skipped:
                 self.board.remove(skipped)
+
+            self.record.add_move(start, (row, col))
+            if self.log:
+                self.log.log_move(self.record)
             self.change_turn()
             return True
 
@@ -54,4 +75,17 @@ class Game:
         return self.board
 
     def winner(self):
-        return self.board.winner()
\ No newline at end of file
+        # A side with no pieces left, or no legal move on its turn, has lost
+        winner = self.board.winner()
+        if winner is None:
+            color = RED if self.red_turn else WHITE
+            if not self.board.get_all_moves(color):
+                winner = WHITE if color == RED else RED
+        return winner
+
+    def end(self, winner):
+        # Record the result once the game is over (winner None for a draw)
+        if self.record.result is None:
+            self.record.result = result_name(winner)
+            if self.log:
+                self.log.end_game(self.record)
\ No newline at end of file
@@ -2,15 +2,18 @@
 
 import pygame
 from utils.constants import WIDTH, HEIGHT, RED, WHITE, BLACK, GREY, GREEN, BLUE, DARK_GREY
+from components.scheduler import FrameScheduler
+from components.text import get_font, text_cache
 
 
 class Menu:
     def __init__(self):
         self.window = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption('Checkers - Game Setup')
-        self.font_large = pygame.font.SysFont('Arial', 48)
-        self.font_medium = pygame.font.SysFont('Arial', 32)
-        self.font_small = pygame.font.SysFont('Arial', 24)
+        self.font_large = get_font('Arial', 48)
+        self.font_medium = get_font('Arial', 32)
+        self.font_small = get_font('Arial', 24)
+        self.text = text_cache
 
     def draw_button(self, rect, text, text_color, button_color, hover=False, selected=False):
         # Draw the button
@@ -23,7 +26,7 @@ class Menu:
             pygame.draw.rect(self.window, BLUE, rect, 2, border_radius=8)
 
         # Render the text
-        text_surface = self.font_medium.render(text, True, text_color)
+        text_surface = self.text.render(self.font_medium, text, text_color)
         text_rect = text_surface.get_rect(center=rect.center)
         self.window.blit(text_surface, text_rect)
 
@@ -81,40 +84,9 @@ class Menu:
         start_button = pygame.Rect(WIDTH // 2 - button_width, start_button_y, button_width * 2, button_height)
 
         menu_active = True
-        clock = pygame.time.Clock()
+        scheduler = FrameScheduler()
 
         while menu_active:
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return None, None, None  # Return None to exit game
-
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    mouse_pos = pygame.mouse.get_pos()
-
-                    # Check opponent buttons
-                    if ai_button.collidepoint(mouse_pos):
-                        play_against_ai = True
-                    elif human_button.collidepoint(mouse_pos):
-                        play_against_ai = False
-
-                    # Check color buttons (if AI opponent)
-                    if play_against_ai:
-                        if red_button.collidepoint(mouse_pos):
-                            ai_color = WHITE  # Player is RED, AI is WHITE
-                        elif white_button.collidepoint(mouse_pos):
-                            ai_color = RED  # Player is WHITE, AI is RED
-
-                        # Check difficulty buttons
-                        for i, button in enumerate(difficulty_buttons):
-                            if button.collidepoint(mouse_pos):
-                                ai_difficulty = i + 1
-
-                    # Check start button
-                    if start_button.collidepoint(mouse_pos):
-                        menu_active = False
-                        return play_against_ai, ai_color, ai_difficulty
-
             # Clear screen with a dark background
             self.window.fill((30, 30, 30))
 
@@ -122,7 +94,7 @@ class Menu:
             mouse_pos = pygame.mouse.get_pos()
 
             # Draw title
-            title_text = self.font_large.render("CHECKERS GAME SETUP", True, WHITE)
+            title_text = self.text.render(self.font_large, "CHECKERS GAME SETUP", WHITE)
             title_rect = title_text.get_rect(center=(WIDTH // 2, title_area.centery))
             self.window.blit(title_text, title_rect)
 
@@ -130,7 +102,7 @@ class Menu:
             pygame.draw.line(self.window, GREY, (margin, title_area.bottom), (WIDTH - margin, title_area.bottom), 2)
 
             # Draw opponent selection section
-            opponent_text = self.font_medium.render("Select Opponent:", True, WHITE)
+            opponent_text = self.text.render(self.font_medium, "Select Opponent:", WHITE)
             opponent_rect = opponent_text.get_rect(center=opponent_label_pos)
             self.window.blit(opponent_text, opponent_rect)
 
@@ -155,7 +127,7 @@ class Menu:
             # Draw color and difficulty selection if AI opponent
             if play_against_ai:
                 # Draw color selection section
-                color_text = self.font_medium.render("You Play As:", True, WHITE)
+                color_text = self.text.render(self.font_medium, "You Play As:", WHITE)
                 color_rect = color_text.get_rect(center=color_label_pos)
                 self.window.blit(color_text, color_rect)
 
@@ -178,7 +150,7 @@ class Menu:
                 )
 
                 # Draw difficulty selection section
-                diff_text = self.font_medium.render("AI Difficulty Level:", True, WHITE)
+                diff_text = self.text.render(self.font_medium, "AI Difficulty Level:", WHITE)
                 diff_rect = diff_text.get_rect(center=difficulty_label_pos)
                 self.window.blit(diff_text, diff_rect)
 
@@ -194,7 +166,7 @@ class Menu:
 
                 # Draw difficulty labels
                 for i, label in enumerate(difficulty_labels):
-                    label_surface = self.font_small.render(label, True, WHITE)
+                    label_surface = self.text.render(self.font_small, label, WHITE)
                     label_rect = label_surface.get_rect(
                         centerx=difficulty_buttons[i].centerx,
                         top=difficulty_buttons[i].bottom + 5
@@ -211,7 +183,37 @@ class Menu:
             )
 
             pygame.display.update()
-            clock.tick(60)
+
+            # Sleep until the next event (mouse movement redraws the hover effects)
+            for event in scheduler.wait():
+                if event.type == pygame.QUIT:
+                    return None, None, None  # Return None to exit game
+
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    mouse_pos = pygame.mouse.get_pos()
+
+                    # Check opponent buttons
+                    if ai_button.collidepoint(mouse_pos):
+                        play_against_ai = True
+                    elif human_button.collidepoint(mouse_pos):
+                        play_against_ai = False
+
+                    # Check color buttons (if AI opponent)
+                    if play_against_ai:
+                        if red_button.collidepoint(mouse_pos):
+                            ai_color = WHITE  # Player is RED, AI is WHITE
+                        elif white_button.collidepoint(mouse_pos):
+                            ai_color = RED  # Player is WHITE, AI is RED
+
+                        # Check difficulty buttons
+                        for i, button in enumerate(difficulty_buttons):
+                            if button.collidepoint(mouse_pos):
+                                ai_difficulty = i + 1
+
+                    # Check start button
+                    if start_button.collidepoint(mouse_pos):
+                        menu_active = False
+                        return play_against_ai, ai_color, ai_difficulty
 
         # Default return if something goes wrong
         return play_against_ai, ai_color, ai_difficulty
\ No newline at end of file
@@ -0,0 +1,213 @@
+# record.py - Game records: live JSONL logging, PDN export, fast replay and streaming import
+#
+# A game log is a JSONL file of events, appended as the game is played:
+#   {"event": "start", "game": "<id>", "start": "<FEN>", "headers": {...}}
+#   {"event": "move", "game": "<id>", "ply": 1, "move": [5, 0, 4, 1]}
+#   {"event": "end", "game": "<id>", "result": "red"}
+# read_games also streams selfplay.py results (one game per line) and PDN files.
+
+import json
+import re
+import time
+import uuid
+
+from components.board import Board
+from components.bitboard import rowcol_to_square, square_to_rowcol
+from utils.constants import RED, WHITE
+
+START_FEN = Board().to_fen(RED)
+
+# Results as written in logs, and in PDN (RED moves first, like Black in PDN)
+RESULTS = ("red", "white", "draw")
+PDN_RESULTS = {"red": "2-0", "white": "0-2", "draw": "1-1", None: "*"}
+PDN_RESULT_NAMES = {value: key for key, value in PDN_RESULTS.items()}
+
+
+def result_name(winner):
+    """Log name of a game result: the winning color, or None for a draw"""
+    return "red" if winner == RED else "white" if winner == WHITE else "draw"
+
+
+class GameRecord:
+    """The moves of one game, from a start position, as (from_row, from_col, to_row, to_col)"""
+
+    def __init__(self, start=START_FEN, moves=None, result=None, headers=None, game_id=None):
+        self.start = start
+        self.moves = list(moves or [])
+        self.result = result  # "red", "white", "draw" or None while unfinished
+        self.headers = dict(headers or {})
+        self.game_id = game_id or uuid.uuid4().hex
+
+    def __len__(self):
+        return len(self.moves)
+
+    def add_move(self, start, end):
+        self.moves.append((start[0], start[1], end[0], end[1]))
+
+    def positions(self):
+        """
+        Replay the game, yielding (board, color to move, move) before every move.
+        The same Board is updated in place; copy it to keep a position.
+        Raises:
+            ValueError: If a move is not legal in its position
+        """
+        board, color = Board.from_fen(self.start)
+        for ply, move in enumerate(self.moves, 1):
+            yield board, color, move
+            color = self._play(board, color, move, ply)
+
+    def replay(self):
+        """
+        Play every move on a fresh Board, without the UI.
+        Returns:
+            tuple: (board, color to move) after the last move
+        """
+        board, color = Board.from_fen(self.start)
+        for ply, move in enumerate(self.moves, 1):
+            color = self._play(board, color, move, ply)
+        return board, color
+
+    def _play(self, board, color, move, ply):
+        # Make one recorded move the way Game does and return the next side to move
+        from_row, from_col, to_row, to_col = move
+        piece = board.get_piece(from_row, from_col)
+        skipped = board.get_valid_moves(piece).get((to_row, to_col)) if piece and piece.color == color else None
+        if skipped is None:
+            raise ValueError(f"Game {self.game_id}: illegal move {tuple(move)} at ply {ply}")
+        board.make_move(piece, (to_row, to_col), skipped)
+        return WHITE if color == RED else RED
+
+    def to_dict(self):
+        return {"game": self.game_id, "start": self.start, "headers": self.headers,
+                "moves": [list(move) for move in self.moves], "result": self.result}
+
+    def to_pdn(self):
+        """The game in PDN, squares numbered 1-32 from the top left"""
+        headers = dict(self.headers, Result=PDN_RESULTS[self.result])
+        if self.start != START_FEN:
+            headers["FEN"] = self.start
+        lines = [f'[{key} "{value}"]' for key, value in headers.items()]
+
+        tokens = []
+        for ply, (board, color, move) in enumerate(self.positions()):
+            from_row, from_col, to_row, to_col = move
+            capture = abs(to_row - from_row) > 1
+            if ply % 2 == 0:
+                tokens.append(f"{ply // 2 + 1}.")
+            tokens.append(f"{rowcol_to_square(from_row, from_col) + 1}{'x' if capture else '-'}"
+                          f"{rowcol_to_square(to_row, to_col) + 1}")
+        tokens.append(PDN_RESULTS[self.result])
+
+        # Wrap the move text at about 80 columns
+        text, line = [], ""
+        for token in tokens:
+            if line and len(line) + len(token) >= 80:
+                text.append(line)
+                line = ""
+            line = f"{line} {token}" if line else token
+        text.append(line)
+        return "\n".join(lines + [""] + text) + "\n"
+
+
+class GameLog:
+    """Appends game events to a JSONL file as they happen, so a crash loses nothing already played"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a")
+
+    def _write(self, event):
+        self._file.write(json.dumps(event) + "\n")
+        self._file.flush()
+
+    def start_game(self, record):
+        self._write({"event": "start", "game": record.game_id, "start": record.start,
+                     "headers": record.headers, "time": time.time()})
+
+    def log_move(self, record):
+        self._write({"event": "move", "game": record.game_id, "ply": len(record.moves),
+                     "move": list(record.moves[-1])})
+
+    def end_game(self, record):
+        self._write({"event": "end", "game": record.game_id, "result": record.result})
+
+    def close(self):
+        self._file.close()
+
+
+def read_jsonl_games(lines):
+    """
+    Stream GameRecords from JSONL lines: game log events (games may be
+    interleaved; unfinished ones come last) or one whole game per line as
+    written by selfplay.py.
+    """
+    open_games = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        entry = json.loads(line)
+
+        event = entry.get("event")
+        if event is None:
+            yield GameRecord(entry.get("start", START_FEN), [tuple(move) for move in entry["moves"]],
+                             entry.get("result"), entry.get("headers"), str(entry.get("game", "")) or None)
+        elif event == "start":
+            open_games[entry["game"]] = GameRecord(entry["start"], headers=entry.get("headers"),
+                                                   game_id=entry["game"])
+        elif event == "move":
+            record = open_games.setdefault(entry["game"], GameRecord(game_id=entry["game"]))
+            record.moves.append(tuple(entry["move"]))
+        elif event == "end":
+            record = open_games.pop(entry["game"], None)
+            if record is not None:
+                record.result = entry["result"]
+                yield record
+
+    yield from open_games.values()
+
+
+_PDN_HEADER = re.compile(r'\[(\w+)\s+"([^"]*)"\]')
+_PDN_MOVE = re.compile(r"^(\d+)([-x]\d+)+$")
+
+
+def read_pdn_games(lines):
+    """Stream GameRecords from PDN text written by GameRecord.to_pdn (or in the same square numbering)"""
+    headers, moves, in_moves = {}, [], False
+
+    def finish():
+        fen = headers.pop("FEN", START_FEN)
+        result = PDN_RESULT_NAMES.get(headers.pop("Result", "*"))
+        return GameRecord(fen, moves, result, headers)
+
+    for line in lines:
+        line = line.strip()
+        header = _PDN_HEADER.match(line)
+        if header:
+            if in_moves:
+                yield finish()
+                headers, moves, in_moves = {}, [], False
+            headers[header.group(1)] = header.group(2)
+            continue
+
+        for token in re.sub(r"\{[^}]*\}", " ", line).split():
+            # Results first: "1-1" and "2-0" also look like moves
+            if token in PDN_RESULT_NAMES:
+                headers.setdefault("Result", token)
+                in_moves = True
+            elif _PDN_MOVE.match(token):
+                squares = re.split(r"[-x]", token)
+                moves.append(square_to_rowcol(int(squares[0]) - 1) + square_to_rowcol(int(squares[-1]) - 1))
+                in_moves = True
+
+    if in_moves or headers:
+        yield finish()
+
+
+def read_games(path):
+    """Stream the games of a PDN (.pdn) or JSONL file one at a time"""
+    with open(path) as f:
+        if path.endswith(".pdn"):
+            yield from read_pdn_games(f)
+        else:
+            yield from read_jsonl_games(f)
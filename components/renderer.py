@@ -2,43 +2,96 @@
 
 import pygame
 from utils.constants import BLACK, GREY, BLUE, SQUARE_SIZE, ROWS, COLS, WIDTH, HEIGHT, RED, WHITE, INFO_HEIGHT, FONT_SIZE, \
-    DARK_GREY, GREEN
+    DARK_GREY, GREEN, PIECE_PADDING
+from components.text import get_font, text_cache
+
+
+def square_center(row, col):
+    """Pixel coordinates of the center of a board square"""
+    return SQUARE_SIZE * col + SQUARE_SIZE // 2, SQUARE_SIZE * row + SQUARE_SIZE // 2
+
+
+def square_rect(row, col):
+    """Screen rectangle of a board square"""
+    return pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
 
 
 class Renderer:
+    """
+    Retained-mode renderer: it remembers what every square and the info panel
+    show, redraws only what changed and updates only those parts of the screen.
+    Anything drawn straight onto the window (win message, stats screen) must be
+    followed by invalidate().
+    """
+
     def __init__(self):
         # Create a window that includes space for the info panel
         self.window = pygame.display.set_mode((WIDTH, HEIGHT + INFO_HEIGHT))
         pygame.display.set_caption('Checkers')
-        self.font = pygame.font.SysFont('Arial', FONT_SIZE)
-        self.small_font = pygame.font.SysFont('Arial', FONT_SIZE - 8)
-
-    def draw_board(self):
-        # Clear the board area (not including info panel)
-        pygame.draw.rect(self.window, BLACK, (0, 0, WIDTH, HEIGHT))
+        self.font = get_font('Arial', FONT_SIZE)
+        self.small_font = get_font('Arial', FONT_SIZE - 8)
+        self.text = text_cache
 
-        # Draw the checkerboard squares
+        # The empty checkerboard, drawn once and copied from whenever a square is redrawn
+        self.background = pygame.Surface((WIDTH, HEIGHT))
+        self.background.fill(BLACK)
         for row in range(ROWS):
             for col in range(row % 2, COLS, 2):
-                pygame.draw.rect(self.window, GREY, (col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+                pygame.draw.rect(self.background, GREY, square_rect(row, col))
+
+        self.invalidate()
 
-    def draw_pieces(self, board):
+    def invalidate(self):
+        # Forget what is on screen: the next frame is drawn and updated in full
+        self._squares = {}  # (row, col) -> (piece color, king, move indicator) as drawn
+        self._panel = None  # Arguments of the last draw_info_panel call
+        self._dirty = []  # Rectangles changed since the last update_display
+        self._full_update = True
+
+    def draw_board(self, board, valid_moves=()):
+        """Redraw the squares whose piece or move indicator changed since the last frame"""
+        if not self._squares:
+            self.window.blit(self.background, (0, 0))
+
+        squares = self._squares
         for row in range(ROWS):
             for col in range(COLS):
                 piece = board.get_piece(row, col)
+                state = (piece.color, piece.king) if piece else None, (row, col) in valid_moves
+                if squares.get((row, col)) == state:
+                    continue
+
+                squares[(row, col)] = state
+                rect = square_rect(row, col)
+                self.window.blit(self.background, rect, rect)
+                if state[1]:
+                    self.draw_valid_move(row, col)
                 if piece:
-                    piece.draw(self.window)
-
-    def draw_valid_moves(self, valid_moves):
-        for move in valid_moves:
-            row, col = move
-            # Draw a more visible indicator for valid moves
-            pygame.draw.circle(self.window, BLUE,
-                               (col * SQUARE_SIZE + SQUARE_SIZE // 2, row * SQUARE_SIZE + SQUARE_SIZE // 2), 15)
-            pygame.draw.circle(self.window, GREY,
-                               (col * SQUARE_SIZE + SQUARE_SIZE // 2, row * SQUARE_SIZE + SQUARE_SIZE // 2), 15, 2)
-
-    def draw_info_panel(self, red_turn, red_pieces, white_pieces, status_message=None):
+                    self.draw_piece(piece)
+                self._dirty.append(rect)
+
+    def draw_piece(self, piece):
+        center = square_center(piece.row, piece.col)
+        radius = SQUARE_SIZE // 2 - PIECE_PADDING
+        pygame.draw.circle(self.window, piece.color, center, radius)
+        if piece.king:
+            # Draw a crown for kings
+            pygame.draw.circle(self.window, BLUE, center, radius // 2)
+
+    def draw_valid_move(self, row, col):
+        # Draw a more visible indicator for valid moves
+        pygame.draw.circle(self.window, BLUE, square_center(row, col), 15)
+        pygame.draw.circle(self.window, GREY, square_center(row, col), 15, 2)
+
+    def draw_info_panel(self, red_turn, red_pieces, white_pieces, status_message=None, search_stats=None):
+        # Nothing to do if the panel would look the same as last frame
+        stats_lines = tuple(search_stats.summary()) if search_stats else ()
+        panel = (red_turn, red_pieces, white_pieces, status_message, stats_lines)
+        if panel == self._panel:
+            return
+        self._panel = panel
+        self._dirty.append(pygame.Rect(0, HEIGHT, WIDTH, INFO_HEIGHT))
+
         # Draw background for info panel
         pygame.draw.rect(self.window, DARK_GREY, (0, HEIGHT, WIDTH, INFO_HEIGHT))
 
@@ -53,15 +106,21 @@ class Renderer:
         # Draw turn indicator (left section)
         turn_text = f"Turn: {'RED' if red_turn else 'WHITE'}"
         turn_color = RED if red_turn else WHITE
-        turn_surface = self.font.render(turn_text, True, turn_color)
+        turn_surface = self.text.render(self.font, turn_text, turn_color)
         self.window.blit(turn_surface, (20, HEIGHT + 15))
 
+        # Draw the AI's last search statistics under the turn indicator
+        if stats_lines:
+            for i, line in enumerate(stats_lines):
+                stats_surface = self.text.render(self.small_font, line, GREY)
+                self.window.blit(stats_surface, (20, HEIGHT + 55 + i * 23))
+
         # Draw piece counts (middle section)
         red_text = f"Red Pieces: {red_pieces}"
         white_text = f"White Pieces: {white_pieces}"
 
-        red_surface = self.font.render(red_text, True, RED)
-        white_surface = self.font.render(white_text, True, WHITE)
+        red_surface = self.text.render(self.font, red_text, RED)
+        white_surface = self.text.render(self.font, white_text, WHITE)
 
         # Position the piece counts in the middle section
         red_x = left_section_width + (middle_section_width - red_surface.get_width()) // 2
@@ -83,28 +142,18 @@ class Renderer:
         # Draw game controls (right section)
         if status_message:
             # Split the message into multiple lines if needed
-            words = status_message.split()
-            lines = []
-            current_line = []
-
-            for word in words:
-                test_line = ' '.join(current_line + [word])
-                test_surface = self.small_font.render(test_line, True, WHITE)
-
-                if test_surface.get_width() < right_section_width - 40:
-                    current_line.append(word)
-                else:
-                    if current_line:  # Don't add empty lines
-                        lines.append(' '.join(current_line))
-                    current_line = [word]
-
-            if current_line:  # Add the last line
-                lines.append(' '.join(current_line))
+            lines = self.text.wrap(self.small_font, status_message, right_section_width - 40)
 
             # Draw each line
             for i, line in enumerate(lines):
-                status_surface = self.small_font.render(line, True, WHITE)
+                status_surface = self.text.render(self.small_font, line, WHITE)
                 self.window.blit(status_surface, (2 * left_section_width + 20, HEIGHT + 15 + i * 25))
 
     def update_display(self):
-        pygame.display.update()
\ No newline at end of file
+        # Push only the changed rectangles to the screen, or everything after invalidate()
+        if self._full_update:
+            pygame.display.update()
+            self._full_update = False
+        elif self._dirty:
+            pygame.display.update(self._dirty)
+        self._dirty = []
\ No newline at end of file
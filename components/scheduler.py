@@ -0,0 +1,53 @@
+# scheduler.py - Event-driven frame scheduling: sleep until something happens instead of redrawing every tick
+
+import pygame
+from utils.constants import MAX_FPS, IDLE_WAKE_MS
+
+# Events the game loop waits for besides input
+AI_START_SEARCH = pygame.event.custom_type()  # The pause before the AI's move is over
+AI_MOVE_READY = pygame.event.custom_type()  # The background search has finished
+
+
+class FrameScheduler:
+    """
+    Runs the game loop only when there is something to do. wait() sleeps in
+    pygame.event.wait until input, a timer or a posted event (such as an AI
+    result) arrives, so an idle window uses no CPU, and frames are never drawn
+    more than max_fps times a second.
+    """
+
+    def __init__(self, max_fps=MAX_FPS, idle_wake_ms=IDLE_WAKE_MS):
+        """
+        Parameters:
+            max_fps: Most frames per second, or 0 for no limit
+            idle_wake_ms: Longest sleep without events, or 0 to sleep until an event arrives
+        """
+        self.max_fps = max_fps
+        self.idle_wake_ms = idle_wake_ms
+        self.clock = pygame.time.Clock()
+
+    def wait(self):
+        """
+        Sleep until at least one event is queued (or idle_wake_ms passes).
+        Returns:
+            list: Every queued event, possibly empty after an idle wake-up
+        """
+        # Pace bursts of events (mouse motion, key repeat) to the frame rate
+        if self.max_fps:
+            self.clock.tick(self.max_fps)
+
+        event = pygame.event.wait(self.idle_wake_ms)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+        return events
+
+    def post(self, event_type, **attributes):
+        # Safe to call from the AI search's callback thread
+        pygame.event.post(pygame.event.Event(event_type, attributes))
+
+    def start_timer(self, event_type, delay_ms):
+        # Post event_type once after delay_ms
+        pygame.time.set_timer(event_type, max(1, delay_ms), loops=1)
+
+    def stop_timer(self, event_type):
+        pygame.time.set_timer(event_type, 0)
@@ -0,0 +1,92 @@
+# text.py - Shared fonts and cached text rendering
+#
+# Font.render is the most expensive call in a frame, and the same few strings are
+# drawn over and over, so rendered surfaces and word-wrapped layouts are kept in
+# small LRU caches.
+
+from collections import OrderedDict
+
+import pygame
+
+# Most surfaces and layouts kept before the least recently used are dropped
+TEXT_CACHE_SIZE = 256
+
+_fonts = {}
+
+
+def get_font(name, size):
+    """The system font of a name and size, created on first use and shared afterwards"""
+    font = _fonts.get((name, size))
+    if font is None:
+        font = _fonts[(name, size)] = pygame.font.SysFont(name, size)
+    return font
+
+
+class TextCache:
+    """LRU caches of rendered text surfaces, keyed by (font, text, color), and of wrapped lines"""
+
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self._surfaces = OrderedDict()
+        self._layouts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, cache, key):
+        value = cache.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        cache.move_to_end(key)
+        return value
+
+    def _put(self, cache, key, value):
+        cache[key] = value
+        if len(cache) > self.max_size:
+            cache.popitem(last=False)
+        return value
+
+    def render(self, font, text, color):
+        """
+        Render antialiased text, reusing the surface from an earlier identical call.
+        The surface is shared, so it must not be drawn on.
+        """
+        key = (font, text, tuple(color))
+        surface = self._get(self._surfaces, key)
+        if surface is None:
+            surface = self._put(self._surfaces, key, font.render(text, True, color))
+        return surface
+
+    def wrap(self, font, text, max_width):
+        """
+        Split text into lines narrower than max_width pixels, breaking between words.
+        Returns:
+            tuple: The lines
+        """
+        key = (font, text, max_width)
+        lines = self._get(self._layouts, key)
+        if lines is None:
+            lines = []
+            current_line = []
+            for word in text.split():
+                test_line = ' '.join(current_line + [word])
+                if font.size(test_line)[0] < max_width:
+                    current_line.append(word)
+                else:
+                    if current_line:  # Don't add empty lines
+                        lines.append(' '.join(current_line))
+                    current_line = [word]
+
+            if current_line:  # Add the last line
+                lines.append(' '.join(current_line))
+            lines = self._put(self._layouts, key, tuple(lines))
+        return lines
+
+    def clear(self):
+        self._surfaces.clear()
+        self._layouts.clear()
+
+
+# Shared by the renderer, the menu and the end-of-game screens
+text_cache = TextCache()
@@ -0,0 +1,179 @@
+# async_ai.py - Runs AI searches in the background so the game loop keeps running
+
+import itertools
+from concurrent.futures import ThreadPoolExecutor, CancelledError, BrokenExecutor
+
+from ai_player import SearchTimeout
+from engine.workers import SPAWN_CONTEXT, process_pool, worker_ai
+
+# Where searches run
+MODE_THREAD = "thread"
+MODE_PROCESS = "process"
+MODES = (MODE_THREAD, MODE_PROCESS)
+
+# Worker process state, set up by _init_process_worker
+_active_search = None
+
+
+def _run_search(ai, game, should_stop):
+    """
+    Run one search.
+    Returns:
+        tuple: (move as ((row, col), (row, col)) or None, the AI's SearchStats or None)
+    """
+    ai.should_stop = should_stop
+    try:
+        result = ai.get_move(game)
+    except SearchTimeout:
+        # Cancelled before any move was found
+        return None, None
+    finally:
+        ai.should_stop = None
+
+    if result is None:
+        return None, ai.stats
+    piece, move = result
+    return ((piece.row, piece.col), move), ai.stats
+
+
+def _init_process_worker(active_search):
+    global _active_search
+    _active_search = active_search
+
+
+def _search_in_process(settings, game, search_id):
+    return _run_search(worker_ai(settings), game, lambda: _active_search.value != search_id)
+
+
+class AsyncAI:
+    """
+    Runs AI.get_move in a background thread or process.
+
+    Only one search runs at a time: submit a search, then poll it (or pass a
+    callback), and cancel it if the result is no longer wanted.
+    """
+
+    def __init__(self, ai, mode=MODE_THREAD):
+        """
+        Parameters:
+            ai: The AI whose settings are used for every search
+            mode: MODE_THREAD to search in a background thread, or
+                MODE_PROCESS to search in a worker process
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+
+        self.ai = ai
+        self.mode = mode
+        self._ids = itertools.count(1)
+        self._future = None
+        self._game = None
+        self.last_stats = None  # SearchStats of the last finished search, if the AI collects them
+        self.last_error = None  # Exception that made the last search fail, if it did
+
+        if mode == MODE_PROCESS:
+            # Shared with the worker: the id of the search it should be running
+            self._active_search = SPAWN_CONTEXT.Value('i', 0, lock=False)
+        else:
+            self._active_search = None
+            self._current_id = 0
+        self._executor = self._start_executor()
+
+    def _start_executor(self):
+        if self.mode == MODE_PROCESS:
+            return process_pool(1, _init_process_worker, self._active_search)
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-search")
+
+    def submit(self, game, callback=None):
+        """
+        Start searching for the AI's move in the given game, cancelling any
+        search still running.
+
+        Parameters:
+            game: The current Game object. It must not change until the search finishes.
+            callback: Optional function called with the move (as returned by
+                poll()) when the search finishes. It runs on a background thread
+                and is not called for cancelled searches. If the search failed,
+                it is called with None and the exception is in last_error.
+        """
+        self.cancel()
+        if isinstance(self.last_error, BrokenExecutor):
+            # The worker died during the last search: start a new one
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._start_executor()
+        self.last_error = None
+        search_id = next(self._ids)
+        self._game = game
+
+        if self.mode == MODE_PROCESS:
+            self._active_search.value = search_id
+            self._future = self._executor.submit(_search_in_process, self.ai.settings(), game, search_id)
+        else:
+            self._current_id = search_id
+            self._future = self._executor.submit(_run_search, self.ai, game,
+                                                 lambda: self._current_id != search_id)
+
+        if callback is not None:
+            self._future.add_done_callback(lambda future: self._on_done(future, game, search_id, callback))
+
+    def busy(self):
+        """True while a submitted search has not finished"""
+        return self._future is not None and not self._future.done()
+
+    def poll(self):
+        """
+        Check on the current search without blocking.
+        Returns:
+            tuple: (finished, move). finished is False while the search is
+            running or if nothing was submitted. Once it finishes, move is the
+            result in the same form as AI.get_move, (piece, (row, col)) or None.
+            A finished result is only returned once. A failed search finishes
+            with None and sets last_error.
+        """
+        if self._future is None or not self._future.done():
+            return False, None
+
+        future, game = self._future, self._game
+        self._future = self._game = None
+        return True, self._result(future, game)
+
+    def cancel(self):
+        """Stop the current search, if any, and discard its result"""
+        if self._future is None:
+            return
+
+        if self.mode == MODE_PROCESS:
+            self._active_search.value = 0
+        else:
+            self._current_id = 0
+        self._future.cancel()
+        self._future = self._game = None
+
+    def shutdown(self):
+        """Cancel any search and stop the background worker"""
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _on_done(self, future, game, search_id, callback):
+        # Searches replaced or cancelled since they were submitted don't report back
+        current = self._active_search.value if self.mode == MODE_PROCESS else self._current_id
+        if current == search_id and not future.cancelled():
+            callback(self._result(future, game))
+
+    def _result(self, future, game):
+        try:
+            found, stats = future.result()
+        except (CancelledError, SearchTimeout):
+            return None
+        except Exception as error:
+            # A crashed worker or an error in the search: report no move rather than
+            # raising on the callback thread, where nobody would see it
+            self.last_error = error
+            return None
+        if stats is not None:
+            self.last_stats = stats
+        if found is None:
+            return None
+
+        start, move = found
+        return game.board.get_piece(*start), move
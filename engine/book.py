@@ -0,0 +1,215 @@
+# book.py - Opening book: builder, compact binary format and memory-mapped lookups
+#
+# Build from deep searches of the opening tree:
+#   python -m engine.book search --plies 4 --depth 6 --out opening.bin
+# Build from recorded games (selfplay.py JSONL, game logs or PDN):
+#   python -m engine.book games results.jsonl game_log.jsonl --plies 12 --out opening.bin
+
+import argparse
+import mmap
+import struct
+import sys
+from bisect import bisect_left
+
+from components.board import Board
+from components.bitboard import rowcol_to_square, square_to_rowcol
+from components.record import START_FEN, read_games
+from utils.constants import RED, WHITE
+from utils.zobrist import SIDE_KEY
+
+# File layout: header, then records sorted by position key.
+# Header: magic, format version, record count
+HEADER = struct.Struct("<4sII")
+MAGIC = b"CKBK"
+VERSION = 1
+# Record: position key (Zobrist key plus side to move), from square, to square, weight
+RECORD = struct.Struct("<QBBH")
+MAX_WEIGHT = 0xFFFF
+
+
+def position_key(board, color):
+    """Book key for a position with the given side to move"""
+    return board.zobrist_key if color == RED else board.zobrist_key ^ SIDE_KEY
+
+
+class OpeningBook:
+    """
+    Read-only opening book backed by a memory-mapped file, so every process
+    using the same book shares one copy of it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} opening book")
+        if HEADER.size + self.count * RECORD.size > len(self._map):
+            self._map.close()
+            raise ValueError(f"{path} is truncated")
+
+        # Lets bisect search the keys in place without reading the whole file
+        self._keys = _RecordKeys(self._map, self.count)
+
+    def __len__(self):
+        return self.count
+
+    def lookup(self, key):
+        """
+        Returns:
+            list: (from (row, col), to (row, col), weight) for every book move of the position
+        """
+        index = bisect_left(self._keys, key)
+        moves = []
+        while index < self.count:
+            record_key, start, end, weight = RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+            if record_key != key:
+                break
+            moves.append((square_to_rowcol(start), square_to_rowcol(end), weight))
+            index += 1
+        return moves
+
+    def probe(self, board, color):
+        """Book moves for the side to move on a Board"""
+        return self.lookup(position_key(board, color))
+
+    def close(self):
+        self._map.close()
+
+
+class _RecordKeys:
+    # Sequence view of the record keys for bisect
+    def __init__(self, data, count):
+        self._data = data
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        return struct.unpack_from("<Q", self._data, HEADER.size + index * RECORD.size)[0]
+
+
+class BookBuilder:
+    """Collects weighted book moves in memory and writes them as a book file"""
+
+    def __init__(self):
+        self.entries = {}  # key -> {(from square, to square): weight}
+
+    def add(self, board, color, start, end, weight=1):
+        """Add weight to a move (from (row, col) to (row, col)) in the position on board"""
+        moves = self.entries.setdefault(position_key(board, color), {})
+        move = (rowcol_to_square(*start), rowcol_to_square(*end))
+        moves[move] = min(MAX_WEIGHT, moves.get(move, 0) + weight)
+
+    def add_game(self, moves, winner, plies):
+        """
+        Add the first plies moves of a game. The winner's moves get weight 2,
+        moves from drawn games weight 1 and the loser's moves are left out.
+
+        Parameters:
+            moves: Sequence of (from_row, from_col, to_row, to_col), RED moving first
+            winner: RED, WHITE or None for a draw
+        """
+        board = Board()
+        color = RED
+        for from_row, from_col, to_row, to_col in moves[:plies]:
+            weight = 1 if winner is None else 2 if winner == color else 0
+            if weight:
+                self.add(board, color, (from_row, from_col), (to_row, to_col), weight)
+
+            piece = board.get_piece(from_row, from_col)
+            skipped = board.get_valid_moves(piece)[(to_row, to_col)]
+            board.make_move(piece, (to_row, to_col), skipped)
+            color = WHITE if color == RED else RED
+
+    def add_searched_tree(self, plies, depth, ai_settings=None):
+        """
+        Walk every line of the opening tree up to plies moves deep, adding the
+        move a fixed-depth search picks in each position.
+
+        Parameters:
+            plies: Depth of the opening tree to cover
+            depth: Search depth used in each position
+            ai_settings: Extra keyword arguments for AI()
+        """
+        from ai_player import AI
+        from components.game import Game
+
+        players = {}
+        for color in (RED, WHITE):
+            players[color] = AI(color, **dict(ai_settings or {}, depth=depth))
+
+        game = Game()
+        try:
+            self._add_searched_position(players, game, RED, 0, plies)
+        finally:
+            for ai in players.values():
+                ai.close()
+
+    def _add_searched_position(self, players, game, color, ply, plies):
+        board = game.board
+        if ply >= plies or board.winner() is not None:
+            return
+
+        game.red_turn = color == RED
+        best = players[color].get_move(game)
+        if best is None:
+            return
+        piece, move = best
+        self.add(board, color, (piece.row, piece.col), move)
+
+        other = WHITE if color == RED else RED
+        for piece, move, skipped in board.get_all_moves(color):
+            undo = board.make_move(piece, move, skipped)
+            self._add_searched_position(players, game, other, ply + 1, plies)
+            board.unmake_move(undo)
+
+    def save(self, path):
+        records = sorted((key, start, end, weight)
+                         for key, moves in self.entries.items()
+                         for (start, end), weight in moves.items())
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(records)))
+            for record in records:
+                f.write(RECORD.pack(*record))
+        return len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an opening book")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    search = subparsers.add_parser("search", help="Search every position of the opening tree")
+    search.add_argument("--plies", type=int, default=4, help="Depth of the opening tree")
+    search.add_argument("--depth", type=int, default=5, help="Search depth per position")
+    search.add_argument("--out", required=True)
+
+    games = subparsers.add_parser("games", help="Collect moves from recorded games")
+    games.add_argument("records", nargs="+", help="selfplay.py results, game logs or PDN files")
+    games.add_argument("--plies", type=int, default=12, help="Moves taken from the start of each game")
+    games.add_argument("--out", required=True)
+
+    args = parser.parse_args()
+    builder = BookBuilder()
+
+    if args.command == "search":
+        builder.add_searched_tree(args.plies, args.depth, {"difficulty": 5})
+    else:
+        for path in args.records:
+            for record in read_games(path):
+                # Only finished games from the normal start position say anything about the opening
+                if record.result is None or record.start != START_FEN:
+                    continue
+                winner = {"red": RED, "white": WHITE}.get(record.result)
+                builder.add_game(record.moves, winner, args.plies)
+
+    count = builder.save(args.out)
+    print(f"Wrote {count} book moves for {len(builder.entries)} positions to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
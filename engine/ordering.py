@@ -0,0 +1,97 @@
+# ordering.py - Move ordering for minimax: killer moves, history heuristic and cutoff statistics
+
+# Killer moves remembered per ply
+KILLER_SLOTS = 2
+
+# History scores are divided by this at the start of every search, so old
+# cutoffs fade instead of dominating later moves
+HISTORY_AGING = 2
+
+
+class MoveOrderer:
+    """
+    Orders the moves of a node across all of the side's pieces: captures
+    first (most pieces captured first), then this ply's killer moves, then
+    quiet moves by how often they caused cutoffs elsewhere in the tree.
+
+    Moves are identified by the search's move keys (from square, to square),
+    so the tables work for both Board and BitBoard searches.
+    """
+
+    def __init__(self):
+        self.killers = {}  # ply -> up to KILLER_SLOTS move keys, most recent first
+        self.history = {}  # move key -> score
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.ordered_nodes = 0  # Nodes whose moves were ordered
+        self.cutoffs = 0  # Nodes that ended with a beta cutoff
+        self.first_move_cutoffs = 0  # Cutoffs caused by the first move tried
+        self.killer_cutoffs = 0  # Cutoffs caused by a killer move
+
+    def new_search(self):
+        """Forget killers, age the history table and reset the statistics"""
+        self.killers.clear()
+        self.history = {key: score // HISTORY_AGING for key, score in self.history.items()
+                        if score >= HISTORY_AGING}
+        self.reset_stats()
+
+    def order(self, entries, ply):
+        """
+        Sort the moves of one node in place.
+
+        Parameters:
+            entries: (piece, move, skipped, key, captures) tuples in board-scan order
+            ply: Distance from the root
+        Returns:
+            list: The same entries, best first. Ties keep board-scan order.
+        """
+        self.ordered_nodes += 1
+        killers = self.killers.get(ply, ())
+        history = self.history
+
+        def priority(entry):
+            key, captures = entry[3], entry[4]
+            if captures:
+                return 0, -captures
+            if key in killers:
+                return 1, killers.index(key)
+            return 2, -history.get(key, 0)
+
+        entries.sort(key=priority)
+        return entries
+
+    def record_cutoff(self, key, captures, ply, depth, index):
+        """
+        Note a beta cutoff caused by the move at position index of the ordered moves.
+        Quiet moves become killers for this ply and earn history credit; deeper
+        subtrees count for more.
+        """
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        if captures:
+            return
+
+        killers = self.killers.setdefault(ply, [])
+        if key in killers:
+            self.killer_cutoffs += 1
+            killers.remove(key)
+        killers.insert(0, key)
+        del killers[KILLER_SLOTS:]
+
+        self.history[key] = self.history.get(key, 0) + depth * depth
+
+    def stats(self):
+        """
+        Returns:
+            dict: Ordering statistics of the current or last search
+        """
+        return {
+            "ordered_nodes": self.ordered_nodes,
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0,
+            "killer_cutoffs": self.killer_cutoffs,
+            "history_entries": len(self.history),
+        }
@@ -0,0 +1,184 @@
+# parallel.py - Splits the root moves of a search across worker processes
+
+import itertools
+import time
+from concurrent.futures import wait, FIRST_COMPLETED
+
+from ai_player import SearchTimeout
+from components.bitboard import BitBoard
+from engine.stats import SearchStats
+from engine.workers import SPAWN_CONTEXT, process_pool, worker_ai
+from utils.constants import RED
+
+# Later root moves are searched against the best score so far, widened by this
+# margin so a move that ties the best still gets an exact score. That keeps the
+# chosen move independent of which worker finishes first.
+TIE_MARGIN = 1e-6
+
+# Seconds between checks for cancellation while waiting on the workers
+POLL_INTERVAL = 0.05
+
+# Worker process state, set up by _init_worker
+_best_bound = None
+_active_search = None
+
+
+def _init_worker(best_bound, active_search):
+    global _best_bound, _active_search
+    _best_bound = best_bound
+    _active_search = active_search
+
+
+def _root_move_squares(board, piece, skipped):
+    # A Board's pieces are sent as their squares: the worker's unpickled board has
+    # its own Piece objects, which the move has to refer to
+    if isinstance(board, BitBoard):
+        return piece, skipped
+    return (piece.row, piece.col), [(captured.row, captured.col) for captured in skipped]
+
+
+def _root_move_pieces(board, start, skipped):
+    # The inverse of _root_move_squares, on the worker's copy of the board
+    if isinstance(board, BitBoard):
+        return start, skipped
+    return board.get_piece(*start), [board.get_piece(*square) for square in skipped]
+
+
+def _search_move(settings, search_id, board, start, move, skipped, depth, deadline):
+    """
+    Score one root move in a worker process.
+    Parameters:
+        start, skipped: The moving piece and captured pieces as given by _root_move_squares
+    Returns:
+        tuple: (score, exact, SearchStats of the task), or None if the search was
+        cancelled or ran out of time
+    """
+    if _active_search.value != search_id:
+        return None
+
+    ai = worker_ai(settings)
+    ai.tt_exact_depth = True
+
+    # Start from the best score any worker has found so far
+    with _best_bound.get_lock():
+        bound = _best_bound.value
+    if ai.color == RED:
+        alpha, beta = bound - TIE_MARGIN, float('inf')
+    else:
+        alpha, beta = float('-inf'), bound + TIE_MARGIN
+
+    piece, skipped = _root_move_pieces(board, start, skipped)
+    ai.nodes = ai.qnodes = ai.quiescence_limit_hits = ai.tablebase_hits = 0
+    # No get_move call sets up the worker AI's statistics, so each task counts into its own
+    stats = ai.stats = SearchStats(ai.color)
+    tt_probes, tt_hits = (ai.tt.probes, ai.tt.hits) if ai.tt is not None else (0, 0)
+    ai.should_stop = lambda: _active_search.value != search_id
+    if deadline is not None:
+        ai.deadline = time.perf_counter() + (deadline - time.time())
+    try:
+        score = ai.search_root_move(board, piece, move, skipped, depth, alpha, beta)
+    except SearchTimeout:
+        return None
+    finally:
+        ai.should_stop = None
+        ai.deadline = None
+        ai.stats = None
+
+    # Fail-soft: a score outside the window is only a bound, and never the best move
+    exact = alpha < score < beta
+    if exact:
+        with _best_bound.get_lock():
+            if (ai.color == RED and score > _best_bound.value) or (ai.color != RED and score < _best_bound.value):
+                _best_bound.value = score
+
+    stats.nodes = ai.nodes
+    stats.qnodes = ai.qnodes
+    stats.quiescence_limit_hits = ai.quiescence_limit_hits
+    stats.tablebase_hits = ai.tablebase_hits
+    if ai.tt is not None:
+        stats.tt_probes = ai.tt.probes - tt_probes
+        stats.tt_hits = ai.tt.hits - tt_hits
+    return score, exact, stats
+
+
+class ParallelRootSearch:
+    """
+    Searches the root moves of a position in a pool of worker processes.
+
+    Each worker scores whole root moves, narrowing its window with the best
+    exact score found by any worker so far. Workers only use transposition
+    table entries of the exact depth searched, so the chosen move is the same
+    however the moves get scheduled.
+    """
+
+    def __init__(self, workers):
+        self._best_bound = SPAWN_CONTEXT.Value('d', 0.0)
+        self._active_search = SPAWN_CONTEXT.Value('i', 0, lock=False)
+        self._ids = itertools.count(1)
+        self._executor = process_pool(workers, _init_worker, self._best_bound, self._active_search)
+
+    def search(self, ai, board, moves, depth, remaining, should_stop):
+        """
+        Score every root move to the given depth.
+
+        Parameters:
+            ai: The AI searching; its settings are copied into the workers
+            board: Board or BitBoard to search from
+            moves: Ordered (piece, move, skipped) root moves
+            depth: Search depth, counting the root move
+            remaining: Seconds left in the time budget, or None
+            should_stop: Function returning True if the search should be abandoned
+        Returns:
+            tuple: (best score, index of the best move, SearchStats summed over
+            the workers' tasks). The score and index are None if the search
+            did not finish.
+        """
+        search_id = next(self._ids)
+        self._active_search.value = search_id
+        with self._best_bound.get_lock():
+            self._best_bound.value = float('-inf') if ai.color == RED else float('inf')
+
+        settings = dict(ai.settings(), workers=1)
+        deadline = time.time() + remaining if remaining is not None else None
+        futures = []
+        for piece, move, skipped in moves:
+            start, captured = _root_move_squares(board, piece, skipped)
+            futures.append(self._executor.submit(_search_move, settings, search_id, board, start, move,
+                                                 captured, depth, deadline))
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            if should_stop() or any(future.result() is None for future in done):
+                self._abandon(futures)
+                return None, None, self._stats(ai, futures)
+
+        # Best exact score, ties going to the earliest move in search order
+        best_score = best_index = None
+        for index, future in enumerate(futures):
+            score, exact, stats = future.result()
+            if not exact:
+                continue
+            if (best_index is None or (ai.color == RED and score > best_score)
+                    or (ai.color != RED and score < best_score)):
+                best_score, best_index = score, index
+
+        return best_score, best_index, self._stats(ai, futures)
+
+    def shutdown(self):
+        # Running tasks see the cleared search id and return almost at once
+        self._active_search.value = 0
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _abandon(self, futures):
+        self._active_search.value = 0
+        for future in futures:
+            future.cancel()
+
+    def _stats(self, ai, futures):
+        # Counters of every task that finished, including those of an abandoned search
+        total = SearchStats(ai.color)
+        for future in futures:
+            if future.done() and not future.cancelled() and future.result() is not None:
+                total.add(future.result()[2])
+        return total
@@ -0,0 +1,68 @@
+# stats.py - Per-move search statistics and their structured log output
+#
+# Every move searched with AI(collect_stats=True) is logged as one JSON object
+# on the "checkers.search" logger. To write them to a file:
+#   logging.getLogger("checkers.search").addHandler(logging.FileHandler("search.jsonl"))
+#   logging.getLogger("checkers.search").setLevel(logging.INFO)
+
+import json
+import logging
+
+from utils.constants import RED
+
+logger = logging.getLogger("checkers.search")
+
+
+class SearchStats:
+    """What one AI.get_move call did"""
+
+    __slots__ = ("color", "source", "nodes", "qnodes", "quiescence_limit_hits", "leaf_evals", "beta_cutoffs",
+                 "tt_probes", "tt_hits", "tablebase_hits", "depth_reached", "max_ply", "elapsed")
+
+    def __init__(self, color):
+        self.color = color
+        self.source = "search"  # "search", "book" or "random"
+        self.nodes = 0  # Positions visited by minimax and the quiescence search
+        self.qnodes = 0  # Of those, positions visited by the quiescence search
+        self.quiescence_limit_hits = 0  # Quiescence positions evaluated early at the node limit
+        self.leaf_evals = 0  # Positions reached at the search horizon
+        self.beta_cutoffs = 0  # Nodes whose remaining moves were pruned
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tablebase_hits = 0
+        self.depth_reached = 0  # Depth of the last completed iteration
+        self.max_ply = 0  # Deepest ply visited
+        self.elapsed = 0.0  # Seconds
+
+    def add(self, other):
+        """Add in the counters of another search, e.g. a root move searched in a worker process"""
+        for name in ("nodes", "qnodes", "quiescence_limit_hits", "leaf_evals", "beta_cutoffs",
+                     "tt_probes", "tt_hits", "tablebase_hits"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.max_ply = max(self.max_ply, other.max_ply)
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self):
+        result = {name: getattr(self, name) for name in self.__slots__}
+        result["color"] = "red" if self.color == RED else "white"
+        result["nodes_per_second"] = round(self.nodes_per_second)
+        return result
+
+    def summary(self):
+        """Short text lines for the info panel"""
+        if self.source != "search":
+            return [f"Move from {self.source}", f"{self.elapsed * 1000:.0f} ms"]
+        tt_rate = f"{self.tt_hits / self.tt_probes:.0%}" if self.tt_probes else "-"
+        return [
+            f"Depth {self.depth_reached} ({self.max_ply})  {self.nodes:,} nodes",
+            f"{self.elapsed * 1000:.0f} ms  {self.nodes_per_second:,.0f} n/s",
+            f"Cutoffs {self.beta_cutoffs:,}  TT {tt_rate}",
+        ]
+
+    def log(self):
+        """Emit the statistics as one structured record on the search logger"""
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(self.to_dict()))
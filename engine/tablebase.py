@@ -0,0 +1,279 @@
+# tablebase.py - Endgame tablebases: retrograde generation and memory-mapped probing
+#
+# Generate tables for every position with up to 3 pieces:
+#   python -m engine.tablebase --pieces 3 --out endgame.tb
+#
+# Results follow the move rules of Board.get_valid_moves (through BitBoard, which
+# mirrors them). A side with no pieces or no legal moves has lost.
+
+import argparse
+import heapq
+import mmap
+import struct
+import sys
+import time
+from array import array
+from itertools import combinations
+from math import comb
+
+from components.bitboard import BitBoard, SQUARES, SQUARE_MASKS, RED_CROWN_MASK, WHITE_CROWN_MASK
+from utils.constants import RED, WHITE
+
+# Results, from the point of view of the side to move
+INVALID, DRAW, WIN, LOSS = range(4)
+
+# Each entry is a 16-bit value: result in the top two bits, distance (plies) in the rest
+RESULT_SHIFT = 14
+MAX_DISTANCE = (1 << RESULT_SHIFT) - 1
+
+# File layout: header, signature directory, then every table's entries back to back
+HEADER = struct.Struct("<4sIII")  # magic, version, max pieces, number of signatures
+DIRECTORY_ENTRY = struct.Struct("<BBBBQI")  # red men, red kings, white men, white kings, offset, size
+MAGIC = b"CKTB"
+VERSION = 1
+
+DEFAULT_MAX_PIECES = 3
+
+
+def material(red, white, kings):
+    """Material signature of a position: (red men, red kings, white men, white kings)"""
+    return ((red & ~kings).bit_count(), (red & kings).bit_count(),
+            (white & ~kings).bit_count(), (white & kings).bit_count())
+
+
+def table_size(signature):
+    red_men, red_kings, white_men, white_kings = signature
+    return 2 * comb(SQUARES, red_men) * comb(SQUARES, red_kings) * comb(SQUARES, white_men) * comb(SQUARES, white_kings)
+
+
+def _rank(mask):
+    # Position of a set of squares among all sets of the same size (combinatorial number system)
+    rank = 0
+    count = 0
+    while mask:
+        low = mask & -mask
+        count += 1
+        rank += comb(low.bit_length() - 1, count)
+        mask ^= low
+    return rank
+
+
+def position_index(signature, red, white, kings, red_to_move):
+    """Index of a position within the table for its signature"""
+    red_men, red_kings, white_men, white_kings = signature
+    index = _rank(red & ~kings)
+    index = index * comb(SQUARES, red_kings) + _rank(red & kings)
+    index = index * comb(SQUARES, white_men) + _rank(white & ~kings)
+    index = index * comb(SQUARES, white_kings) + _rank(white & kings)
+    return index * 2 + (0 if red_to_move else 1)
+
+
+def signatures(max_pieces):
+    """
+    Every material signature with both sides on the board and at most
+    max_pieces pieces, in an order where captures and crownings always lead
+    to a signature that comes earlier.
+    """
+    result = []
+    for total in range(2, max_pieces + 1):
+        for red_men in range(total + 1):
+            for red_kings in range(total + 1 - red_men):
+                for white_men in range(total + 1 - red_men - red_kings):
+                    white_kings = total - red_men - red_kings - white_men
+                    if red_men + red_kings and white_men + white_kings:
+                        result.append((red_men, red_kings, white_men, white_kings))
+    return sorted(result, key=lambda s: (sum(s), s[0] + s[2], s))
+
+
+def _placements(signature):
+    # Every legal (red, white, kings) placement; men never stand on their crowning row
+    red_men, red_kings, white_men, white_kings = signature
+    for rm in combinations(range(SQUARES), red_men):
+        rm_mask = sum(SQUARE_MASKS[s] for s in rm)
+        if rm_mask & RED_CROWN_MASK:
+            continue
+        for rk in combinations(range(SQUARES), red_kings):
+            rk_mask = sum(SQUARE_MASKS[s] for s in rk)
+            if rk_mask & rm_mask:
+                continue
+            red = rm_mask | rk_mask
+            for wm in combinations(range(SQUARES), white_men):
+                wm_mask = sum(SQUARE_MASKS[s] for s in wm)
+                if wm_mask & (red | WHITE_CROWN_MASK):
+                    continue
+                for wk in combinations(range(SQUARES), white_kings):
+                    wk_mask = sum(SQUARE_MASKS[s] for s in wk)
+                    if wk_mask & (red | wm_mask):
+                        continue
+                    yield red, wm_mask | wk_mask, rk_mask | wk_mask
+
+
+def _encode(result, distance):
+    return (result << RESULT_SHIFT) | min(distance, MAX_DISTANCE)
+
+
+class TablebaseGenerator:
+    """Builds the tables by retrograde analysis, smallest material first"""
+
+    def __init__(self, max_pieces=DEFAULT_MAX_PIECES, verbose=False):
+        self.max_pieces = max_pieces
+        self.verbose = verbose
+        self.tables = {}  # signature -> array('H') of encoded entries
+
+    def lookup(self, red, white, kings, red_to_move):
+        """(result, distance) of an already generated position"""
+        if not (red if red_to_move else white):
+            return LOSS, 0
+        signature = material(red, white, kings)
+        value = self.tables[signature][position_index(signature, red, white, kings, red_to_move)]
+        return value >> RESULT_SHIFT, value & MAX_DISTANCE
+
+    def generate(self):
+        for signature in signatures(self.max_pieces):
+            start = time.perf_counter()
+            self.tables[signature] = self._solve(signature)
+            if self.verbose:
+                print(f"{signature}: {table_size(signature)} entries in {time.perf_counter() - start:.1f}s",
+                      file=sys.stderr)
+        return self.tables
+
+    def _solve(self, signature):
+        table = array("H", [INVALID]) * table_size(signature)
+
+        parents = {}        # index -> indexes of same-signature positions moving into it
+        unresolved = {}     # index -> children not yet known to be wins for the opponent
+        longest = {}        # index -> longest opponent win among resolved children
+        heap = []           # (distance, index, result) candidate results, shortest first
+        resolved = {}
+
+        for red, white, kings in _placements(signature):
+            for red_to_move in (True, False):
+                index = position_index(signature, red, white, kings, red_to_move)
+                table[index] = _encode(DRAW, 0)
+                board = BitBoard(red, white, kings)
+                color = RED if red_to_move else WHITE
+                moves = board.get_all_moves(color)
+                if not moves:
+                    heapq.heappush(heap, (0, index, LOSS))
+                    continue
+
+                pending = 0
+                furthest = 0
+                for square, dest, captured in moves:
+                    undo = board.make_move(square, dest, captured)
+                    child_signature = material(board.red, board.white, board.kings)
+                    if child_signature == signature:
+                        child = position_index(signature, board.red, board.white, board.kings, not red_to_move)
+                        parents.setdefault(child, []).append(index)
+                        pending += 1
+                    else:
+                        result, distance = self.lookup(board.red, board.white, board.kings, not red_to_move)
+                        if result == WIN:
+                            furthest = max(furthest, distance)
+                        else:
+                            # Never counted down: with a winning or drawn reply the position is never lost
+                            pending += 1
+                            if result == LOSS:
+                                heapq.heappush(heap, (distance + 1, index, WIN))
+                    board.unmake_move(undo)
+
+                unresolved[index] = pending
+                longest[index] = furthest
+                if not pending:
+                    heapq.heappush(heap, (furthest + 1, index, LOSS))
+
+        # Resolve positions shortest distance first, so every distance is exact
+        while heap:
+            distance, index, result = heapq.heappop(heap)
+            if index in resolved:
+                continue
+            resolved[index] = result
+            table[index] = _encode(result, distance)
+
+            for parent in parents.get(index, ()):
+                if parent in resolved:
+                    continue
+                if result == LOSS:
+                    heapq.heappush(heap, (distance + 1, parent, WIN))
+                else:
+                    unresolved[parent] -= 1
+                    longest[parent] = max(longest[parent], distance)
+                    if unresolved[parent] == 0:
+                        heapq.heappush(heap, (longest[parent] + 1, parent, LOSS))
+
+        return table
+
+    def save(self, path):
+        order = signatures(self.max_pieces)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.max_pieces, len(order)))
+            offset = 0
+            for signature in order:
+                f.write(DIRECTORY_ENTRY.pack(*signature, offset, len(self.tables[signature])))
+                offset += len(self.tables[signature])
+            for signature in order:
+                table = self.tables[signature]
+                if sys.byteorder != "little":
+                    table = array("H", table)
+                    table.byteswap()
+                table.tofile(f)
+
+
+class Tablebase:
+    """Read-only, memory-mapped endgame tablebase"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.max_pieces, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} tablebase")
+
+        data_start = HEADER.size + count * DIRECTORY_ENTRY.size
+        self._offsets = {}
+        for i in range(count):
+            *signature, offset, _size = DIRECTORY_ENTRY.unpack_from(self._map, HEADER.size + i * DIRECTORY_ENTRY.size)
+            self._offsets[tuple(signature)] = data_start + offset * 2
+
+    def probe_masks(self, red, white, kings, red_to_move):
+        """
+        Returns:
+            tuple: (result, distance in plies) for the side to move, or None if not covered
+        """
+        if not (red if red_to_move else white):
+            return LOSS, 0
+        signature = material(red, white, kings)
+        offset = self._offsets.get(signature)
+        if offset is None:
+            return None
+        value = struct.unpack_from("<H", self._map, offset + 2 * position_index(signature, red, white, kings,
+                                                                                red_to_move))[0]
+        return value >> RESULT_SHIFT, value & MAX_DISTANCE
+
+    def probe(self, board, red_to_move):
+        """Probe a Board or BitBoard"""
+        if isinstance(board, BitBoard):
+            return self.probe_masks(board.red, board.white, board.kings, red_to_move)
+        red, white, kings = board.masks()
+        return self.probe_masks(red, white, kings, red_to_move)
+
+    def close(self):
+        self._map.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate endgame tablebases")
+    parser.add_argument("--pieces", type=int, default=DEFAULT_MAX_PIECES, help="Largest number of pieces covered")
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    generator = TablebaseGenerator(args.pieces, verbose=True)
+    generator.generate()
+    generator.save(args.out)
+
+
+if __name__ == "__main__":
+    main()
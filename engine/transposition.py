@@ -0,0 +1,86 @@
+# transposition.py - Fixed-size transposition table for the minimax search
+
+# Bound types stored with each score
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Replacement policies
+REPLACE_DEPTH = "depth"    # keep the deeper entry unless the stored one is from an older search
+REPLACE_ALWAYS = "always"  # newest entry always wins
+REPLACEMENT_POLICIES = (REPLACE_DEPTH, REPLACE_ALWAYS)
+
+# Rough size of one stored entry (tuple plus its ints) used to turn a memory cap into a slot count
+ENTRY_BYTES = 160
+
+DEFAULT_SIZE_MB = 16
+
+
+class TranspositionTable:
+    def __init__(self, size_mb=DEFAULT_SIZE_MB, replacement=REPLACE_DEPTH):
+        """
+        Create a transposition table.
+
+        Parameters:
+            size_mb: Memory cap in megabytes. The table gets the largest
+                power-of-two number of slots that fits in it.
+            replacement: REPLACE_DEPTH or REPLACE_ALWAYS
+        """
+        if replacement not in REPLACEMENT_POLICIES:
+            raise ValueError(f"Unknown replacement policy: {replacement}")
+
+        slots = 1
+        while slots * 2 * ENTRY_BYTES <= size_mb * 1024 * 1024:
+            slots *= 2
+
+        self.size_mb = size_mb
+        self.replacement = replacement
+        self.mask = slots - 1
+        self.slots = [None] * slots
+        self.generation = 0
+
+        # Counters
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def __len__(self):
+        return len(self.slots)
+
+    def new_search(self):
+        """Age existing entries so a new search may replace them regardless of depth"""
+        self.generation += 1
+
+    def clear(self):
+        self.slots = [None] * len(self.slots)
+        self.generation = 0
+        self.probes = self.hits = self.stores = self.overwrites = 0
+
+    def probe(self, key):
+        """
+        Look up a position.
+        Returns:
+            tuple: (depth, bound, score, best_move) or None if the position is not stored
+        """
+        self.probes += 1
+        entry = self.slots[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1:5]
+        return None
+
+    def store(self, key, depth, bound, score, best_move):
+        index = key & self.mask
+        entry = self.slots[index]
+
+        if entry is not None:
+            if (self.replacement == REPLACE_DEPTH and entry[0] != key
+                    and entry[5] == self.generation and entry[1] > depth):
+                return
+            self.overwrites += 1
+
+        self.slots[index] = (key, depth, bound, score, best_move, self.generation)
+        self.stores += 1
+
+    def usage(self):
+        """Fraction of slots in use"""
+        return sum(1 for entry in self.slots if entry is not None) / len(self.slots)
@@ -0,0 +1,32 @@
+# workers.py - Worker process pools shared by the background and parallel searches
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from ai_player import AI
+
+# Spawn rather than fork so workers don't inherit the parent's SDL state
+SPAWN_CONTEXT = multiprocessing.get_context("spawn")
+
+# The AI kept in this worker process, and the settings it was built from
+_worker_ai = None
+_worker_settings = None
+
+
+def process_pool(workers, initializer, *initargs):
+    """A pool of spawned worker processes, each set up with initializer(*initargs)"""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=SPAWN_CONTEXT,
+                               initializer=initializer, initargs=initargs)
+
+
+def worker_ai(settings):
+    """
+    The AI for a task in a worker process. One AI is kept per worker and reused
+    while the settings stay the same, so its transposition table survives
+    between tasks.
+    """
+    global _worker_ai, _worker_settings
+    if _worker_ai is None or _worker_settings != settings:
+        _worker_ai = AI(**settings)
+        _worker_settings = settings
+    return _worker_ai
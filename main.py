@@ -1,19 +1,30 @@
 # improved_main.py - Improved main file with better UI integration
 
 import pygame, sys, time
-from utils.constants import SQUARE_SIZE, RED, WHITE, HEIGHT, WIDTH
+from utils.constants import SQUARE_SIZE, RED, WHITE, HEIGHT, WIDTH, MANDATORY_CAPTURE
 from components.game import Game
 from components.renderer import Renderer
 from ai_player import AI
+from engine.async_ai import AsyncAI, MODE_PROCESS
 from components.menu import Menu
+from components.record import GameLog
+from components.scheduler import FrameScheduler, AI_START_SEARCH, AI_MOVE_READY
+from components.text import get_font, text_cache
 from utils.stats import StatsTracker
 
+# Every game played is appended here; read it back with components.record.read_games
+GAME_LOG_FILE = "game_log.jsonl"
+
 
 def main():
     pygame.init()
 
     # Create stats tracker
     stats = StatsTracker()
+    game_log = GameLog(GAME_LOG_FILE)
+
+    # Sleeps between events instead of redrawing at a fixed frame rate
+    scheduler = FrameScheduler()
 
     # Game loop
     running_game = True
@@ -29,19 +40,23 @@ def main():
             break
 
         # Initialize the game
-        game = Game()
+        game = Game(game_log, MANDATORY_CAPTURE)
         renderer = Renderer()
-        clock = pygame.time.Clock()
         running = True
 
         # Initialize AI if playing against it
-        ai = AI(ai_color, ai_difficulty) if play_against_ai else None
+        ai = AI(ai_color, ai_difficulty, collect_stats=True,
+                mandatory_capture=MANDATORY_CAPTURE) if play_against_ai else None
+
+        # Searches run in a worker process so the window keeps responding
+        ai_search = AsyncAI(ai, MODE_PROCESS) if play_against_ai else None
 
         # Player color (opposite of AI color)
         player_color = WHITE if ai_color == RED else RED if play_against_ai else None
 
-        # Track if the AI is currently thinking
+        # Track if the AI is currently thinking (waiting to start its search, or searching)
         ai_thinking = False
+        ai_error = None  # Set when a search fails; the AI stops playing until the game restarts
 
         # Flag to show stats after game
         show_stats = False
@@ -51,97 +66,39 @@ def main():
         if play_against_ai:
             game_mode = f"Playing against AI (Level {ai_difficulty}). You are {'RED' if player_color == RED else 'WHITE'}."
             controls = "Press 1-5 to change difficulty. ESC to restart. S for stats."
+            thinking_controls = "AI is thinking... Press ESC to abort and restart the game."
         else:
             game_mode = "Two Player Mode"
             controls = "Press ESC to restart. S for stats."
 
-        # Main game loop
+        # Main game loop: draw what changed, then sleep until the next event
         while running:
-            clock.tick(60)
-
             # Check if it's AI's turn
-            if play_against_ai and ((game.red_turn and ai.color == RED) or
-                                    (not game.red_turn and ai.color == WHITE)):
-                if not ai_thinking:
-                    # Start AI thinking (visual indicator could be added here)
-                    ai_thinking = True
-                    # Draw "AI Thinking..." message
-                    renderer.draw_board()
-                    renderer.draw_valid_moves(game.valid_moves)
-                    renderer.draw_pieces(game.board)
-                    board = game.get_board()
-                    renderer.draw_info_panel(
-                        game.red_turn,
-                        board.red_pieces,
-                        board.white_pieces,
-                        f"{game_mode} AI is thinking..."
-                    )
-                    renderer.update_display()
-
-                    # Add a small delay to make the AI's move visible
-                    pygame.time.delay(800 - ai_difficulty * 100)  # Faster delay at higher difficulties
-
-                    # Get the AI's move
-                    ai_move = ai.get_move(game)
-
-                    if ai_move:
-                        piece, move = ai_move
-                        # Select the piece (this will load valid moves)
-                        game.select(piece.row, piece.col)
-                        # Make the move
-                        game.select(move[0], move[1])
-
-                    ai_thinking = False
-
-            # Process events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                    running_game = False
-
-                if event.type == pygame.KEYDOWN:
-                    # Change AI difficulty with number keys 1-5
-                    if event.key in [pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4, pygame.K_5]:
-                        if play_against_ai:
-                            new_difficulty = int(event.unicode)
-                            ai.set_difficulty(new_difficulty)
-                            ai_difficulty = new_difficulty
-                            game_mode = f"Playing against AI (Level {ai_difficulty}). You are {'RED' if player_color == RED else 'WHITE'}."
-                    # Restart game with ESC key
-                    elif event.key == pygame.K_ESCAPE:
-                        running = False
-                    # Show stats with S key
-                    elif event.key == pygame.K_s:
-                        show_stats = True
-
-                # Handle clicks (only when it's the player's turn)
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if not play_against_ai or (
-                            (game.red_turn and ai.color != RED) or
-                            (not game.red_turn and ai.color != WHITE)):
-
-                        pos = pygame.mouse.get_pos()
-                        # Only register clicks on the board area, not the info panel
-                        if pos[1] < HEIGHT:
-                            col, row = pos[0] // SQUARE_SIZE, pos[1] // SQUARE_SIZE
-                            game.select(row, col)
+            if play_against_ai and not ai_thinking and not ai_error and (
+                    (game.red_turn and ai.color == RED) or (not game.red_turn and ai.color == WHITE)):
+                # Start AI thinking after a moment to make the AI's move visible (faster at higher difficulties).
+                # The search reports back with an AI_MOVE_READY event; the loop keeps handling events meanwhile.
+                ai_thinking = True
+                scheduler.start_timer(AI_START_SEARCH, 800 - ai_difficulty * 100)
 
-            # Draw everything
-            renderer.draw_board()
-            renderer.draw_valid_moves(game.valid_moves)
-            renderer.draw_pieces(game.board)
+            # Only the squares and panel parts that changed are redrawn
+            renderer.draw_board(game.board, game.valid_moves)
 
             # Draw the info panel with current game state
             board = game.get_board()
 
             # Display appropriate status message
-            status_message = f"{game_mode} {controls}"
+            if ai_error:
+                status_message = f"{game_mode} {ai_error} Press ESC to restart."
+            else:
+                status_message = f"{game_mode} {thinking_controls if ai_thinking else controls}"
 
             renderer.draw_info_panel(
                 game.red_turn,
                 board.red_pieces,
                 board.white_pieces,
-                status_message
+                status_message,
+                ai_search.last_stats if ai_search else None
             )
 
             # Check for the winner
@@ -149,32 +106,34 @@ def main():
             if winner:
                 game_winner = winner
                 # Create a win message
-                font = pygame.font.SysFont('Arial', 50)
+                font = get_font('Arial', 50)
                 win_text = f"{'RED' if winner == RED else 'WHITE'} WINS!"
                 win_color = winner
-                win_surface = font.render(win_text, True, win_color)
+                win_surface = text_cache.render(font, win_text, win_color)
 
                 # Display a win message in the center of the board
                 win_rect = win_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2))
                 renderer.window.blit(win_surface, win_rect)
 
                 # Display a restart message
-                restart_font = pygame.font.SysFont('Arial', 30)
+                restart_font = get_font('Arial', 30)
                 restart_text = "Press ESC to play again or S for stats"
-                restart_surface = restart_font.render(restart_text, True, WHITE)
+                restart_surface = text_cache.render(restart_font, restart_text, WHITE)
                 restart_rect = restart_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 60))
                 renderer.window.blit(restart_surface, restart_rect)
+                renderer.invalidate()
 
-                # Record the win in stats
+                # Record the win in stats and the game log
                 stats.record_win(winner)
+                game.end(winner)
 
                 # Update display to show a win message
                 renderer.update_display()
 
-                # Wait for key press to continue
+                # Sleep until a key is pressed to continue
                 waiting_for_key = True
                 while waiting_for_key:
-                    for event in pygame.event.get():
+                    for event in scheduler.wait():
                         if event.type == pygame.QUIT:
                             running = False
                             running_game = False
@@ -185,20 +144,20 @@ def main():
                                 waiting_for_key = False
                             elif event.key == pygame.K_ESCAPE:
                                 waiting_for_key = False
-                    clock.tick(30)
 
                 # End the current game loop
                 running = False
 
             # Draw stats if requested
             if show_stats:
-                stats.draw_stats(renderer.window, pygame.font.SysFont('Arial', 30))
+                stats.draw_stats(renderer.window, get_font('Arial', 30))
+                renderer.invalidate()
                 renderer.update_display()
 
-                # Wait for a key press to continue
+                # Sleep until a key press or click to continue
                 waiting = True
                 while waiting:
-                    for event in pygame.event.get():
+                    for event in scheduler.wait():
                         if event.type == pygame.QUIT:
                             running = False
                             running_game = False
@@ -209,7 +168,72 @@ def main():
 
             # Update display
             renderer.update_display()
+            if not running:
+                break
+
+            # Process events, sleeping until there are some
+            for event in scheduler.wait():
+                if event.type == pygame.QUIT:
+                    running = False
+                    running_game = False
+
+                # The window was uncovered: draw everything again
+                if event.type == pygame.WINDOWEXPOSED:
+                    renderer.invalidate()
+
+                # The pause before the AI's move is over: start the background search
+                if event.type == AI_START_SEARCH and ai_thinking:
+                    ai_search.submit(game, callback=lambda ai_move: scheduler.post(AI_MOVE_READY))
+
+                # The background search is done: make the AI's move
+                if event.type == AI_MOVE_READY and ai_thinking:
+                    finished, ai_move = ai_search.poll()
+                    if finished:
+                        if ai_move:
+                            piece, move = ai_move
+                            # Select the piece (this will load valid moves)
+                            game.select(piece.row, piece.col)
+                            # Make the move
+                            game.select(move[0], move[1])
+                        elif ai_search.last_error is not None:
+                            # The search failed: say so instead of thinking forever
+                            ai_error = f"AI search failed ({type(ai_search.last_error).__name__})."
+
+                        ai_thinking = False
+
+                if event.type == pygame.KEYDOWN:
+                    # Change AI difficulty with number keys 1-5
+                    if event.key in [pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4, pygame.K_5]:
+                        if play_against_ai:
+                            new_difficulty = int(event.unicode)
+                            ai.set_difficulty(new_difficulty)
+                            ai_difficulty = new_difficulty
+                            game_mode = f"Playing against AI (Level {ai_difficulty}). You are {'RED' if player_color == RED else 'WHITE'}."
+                    # Restart game with ESC key (this also aborts a running AI search)
+                    elif event.key == pygame.K_ESCAPE:
+                        running = False
+                    # Show stats with S key
+                    elif event.key == pygame.K_s:
+                        show_stats = True
+
+                # Handle clicks (only when it's the player's turn)
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    if not play_against_ai or (
+                            (game.red_turn and ai.color != RED) or
+                            (not game.red_turn and ai.color != WHITE)):
+
+                        pos = pygame.mouse.get_pos()
+                        # Only register clicks on the board area, not the info panel
+                        if pos[1] < HEIGHT:
+                            col, row = pos[0] // SQUARE_SIZE, pos[1] // SQUARE_SIZE
+                            game.select(row, col)
+
+        # Stop any search, or pending search start, still running for the game that just ended
+        scheduler.stop_timer(AI_START_SEARCH)
+        if ai_search:
+            ai_search.shutdown()
 
+    game_log.close()
     pygame.quit()
     sys.exit()
 
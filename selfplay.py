@@ -0,0 +1,163 @@
+# selfplay.py - Headless AI-vs-AI tournaments, results streamed as JSONL
+#
+# Example:
+#   python selfplay.py --games 1000 --workers 8 \
+#       --a '{"difficulty": 4}' --b '{"time_budget_ms": 50, "eval_weights": {"king": 20}}' \
+#       --out results.jsonl
+#   python selfplay.py --games 100 --a '{"depth": 7}' --b '{"depth": 5}'
+
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ai_player import AI
+from components.game import Game
+from utils.constants import RED, WHITE
+
+# Games still running after this many plies are scored as draws
+DEFAULT_MAX_PLIES = 200
+
+
+def play_game(game_id, red_config, white_config, seed=None, opening_plies=0, max_plies=DEFAULT_MAX_PLIES):
+    """
+    Play one AI-vs-AI game without a window.
+
+    Parameters:
+        game_id: Identifier copied into the result
+        red_config, white_config: Keyword arguments for AI() (color excluded)
+        seed: Seed for the random opening and the AIs' own randomness
+        opening_plies: Number of random moves played before the AIs take over,
+            so games between the same configurations differ
+        max_plies: Ply limit after which the game is a draw
+    Returns:
+        dict: The game record written as one JSONL line
+    """
+    rng = random.Random(seed)
+    players = {
+        RED: AI(RED, seed=rng.random(), **red_config),
+        WHITE: AI(WHITE, seed=rng.random(), **white_config),
+    }
+
+    game = Game()
+    nodes = {RED: 0, WHITE: 0}
+    move_times = {RED: [], WHITE: []}
+    moves = []
+    result = None
+    plies = 0
+
+    while plies < max_plies:
+        color = RED if game.red_turn else WHITE
+        player = players[color]
+
+        if game.winner() is not None:
+            result = game.winner()
+            break
+
+        start = time.perf_counter()
+        if plies < opening_plies:
+            move = player.get_random_move(game)
+        else:
+            move = player.get_move(game)
+            move_times[color].append((time.perf_counter() - start) * 1000)
+            nodes[color] += player.nodes
+
+        # A side that cannot move loses
+        if move is None:
+            result = WHITE if color == RED else RED
+            break
+
+        piece, (row, col) = move
+        moves.append((piece.row, piece.col, row, col))
+        game.select(piece.row, piece.col)
+        game.select(row, col)
+        plies += 1
+
+    for player in players.values():
+        player.close()
+
+    return {
+        "game": game_id,
+        "seed": seed,
+        "result": "red" if result == RED else "white" if result == WHITE else "draw",
+        "plies": plies,
+        "red_pieces": game.board.red_pieces,
+        "white_pieces": game.board.white_pieces,
+        "nodes": {"red": nodes[RED], "white": nodes[WHITE]},
+        "avg_move_ms": {
+            "red": sum(move_times[RED]) / len(move_times[RED]) if move_times[RED] else 0,
+            "white": sum(move_times[WHITE]) / len(move_times[WHITE]) if move_times[WHITE] else 0,
+        },
+        "move_ms": {"red": move_times[RED], "white": move_times[WHITE]},
+        "moves": moves,
+    }
+
+
+def _play_match_game(game_id, config_a, config_b, seed, opening_plies, max_plies):
+    # Alternate colors so each configuration plays both sides equally
+    a_is_red = game_id % 2 == 0
+    red_config, white_config = (config_a, config_b) if a_is_red else (config_b, config_a)
+
+    record = play_game(game_id, red_config, white_config, seed, opening_plies, max_plies)
+    record["red_player"] = "a" if a_is_red else "b"
+    record["white_player"] = "b" if a_is_red else "a"
+    if record["result"] == "draw":
+        record["winner"] = "draw"
+    else:
+        record["winner"] = record[record["result"] + "_player"]
+    return record
+
+
+def run_match(config_a, config_b, games, workers=1, seed=0, opening_plies=4, max_plies=DEFAULT_MAX_PLIES):
+    """
+    Play a match between two AI configurations, yielding each game record as it finishes.
+    """
+    seeds = random.Random(seed)
+    jobs = [(game_id, config_a, config_b, seeds.getrandbits(32), opening_plies, max_plies)
+            for game_id in range(games)]
+
+    if workers <= 1:
+        for job in jobs:
+            yield _play_match_game(*job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_play_match_game, *job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless AI-vs-AI games and write results as JSONL")
+    parser.add_argument("--a", default="{}", help="JSON keyword arguments for AI() of player a")
+    parser.add_argument("--b", default="{}", help="JSON keyword arguments for AI() of player b")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=1, help="Games played in parallel")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--opening-plies", type=int, default=4, help="Random moves at the start of each game")
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES)
+    parser.add_argument("--out", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    config_a = json.loads(args.a)
+    config_b = json.loads(args.b)
+    out = open(args.out, "w") if args.out else sys.stdout
+    score = {"a": 0, "b": 0, "draw": 0}
+
+    try:
+        for record in run_match(config_a, config_b, args.games, args.workers, args.seed,
+                                args.opening_plies, args.max_plies):
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            score[record["winner"]] += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"a: {score['a']}  b: {score['b']}  draws: {score['draw']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,4 +20,19 @@ PIECE_OUTLINE = 2
 
 # UI constants
 INFO_HEIGHT = 130  # Height of the info panel
-FONT_SIZE = 30
\ No newline at end of file
+FONT_SIZE = 30
+
+# Frame pacing: the game loop sleeps until an event arrives, then redraws what changed
+MAX_FPS = 60  # Most frames drawn per second (0 for no limit)
+IDLE_WAKE_MS = 0  # Longest sleep without events before the loop runs anyway (0 to sleep until an event)
+
+# Rules
+MANDATORY_CAPTURE = False  # Captures must be made when available (standard checkers)
+
+# AI evaluation weights
+DEFAULT_EVAL_WEIGHTS = {
+    "man": 10,      # Value of a regular piece
+    "king": 15,     # Value of a king
+    "advance": 1,   # Multiplier for the bonus of pieces close to being crowned
+    "center": 1,    # Bonus for pieces in the center 4x4 area
+}
\ No newline at end of file
@@ -0,0 +1,24 @@
+# zobrist.py - Zobrist hashing keys shared by every board representation
+
+import random
+from utils.constants import ROWS, COLS, RED
+
+# Fixed seed so keys are identical across runs and worker processes
+_rng = random.Random(20240917)
+
+# PIECE_KEYS[kind][square] for the 32 dark squares (square = row * 4 + col // 2)
+# Kinds: 0 red man, 1 red king, 2 white man, 3 white king
+PIECE_KEYS = tuple(tuple(_rng.getrandbits(64) for _ in range(ROWS * COLS // 2)) for _ in range(4))
+
+# XORed in when WHITE is the side to move
+SIDE_KEY = _rng.getrandbits(64)
+
+
+def piece_kind(color, king):
+    """Return the PIECE_KEYS row for a piece of this color and king status"""
+    return (0 if color == RED else 2) + (1 if king else 0)
+
+
+def piece_key(piece):
+    """Return the Zobrist key of a Piece on its current square"""
+    return PIECE_KEYS[piece_kind(piece.color, piece.king)][piece.row * 4 + piece.col // 2]